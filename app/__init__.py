@@ -104,7 +104,7 @@ def register_error_handlers(app):
         """Handler for 401 (unauthorized) errors."""
         logger.warning(
             "Unauthorized access attempt detected.",
-            str(err),
+            error=str(err),
             path=request.path,
             method=request.method,
             request_id=getattr(g, "request_id", None),
@@ -122,7 +122,7 @@ def register_error_handlers(app):
         """Handler for 403 (forbidden) errors."""
         logger.warning(
             "Forbidden access attempt detected.",
-            str(err),
+            error=str(err),
             path=request.path,
             method=request.method,
             request_id=getattr(g, "request_id", None),
@@ -140,7 +140,7 @@ def register_error_handlers(app):
         """Handler for 404 (resource not found) errors."""
         logger.warning(
             "Resource not found.",
-            str(err),
+            error=str(err),
             path=request.path,
             method=request.method,
             request_id=getattr(g, "request_id", None),
@@ -158,7 +158,7 @@ def register_error_handlers(app):
         """Handler for 400 (bad request) errors."""
         logger.warning(
             "Bad request received.",
-            str(err),
+            error=str(err),
             path=request.path,
             method=request.method,
             request_id=getattr(g, "request_id", None),
@@ -176,7 +176,7 @@ def register_error_handlers(app):
         """Handler for 415 (unsupported media type) errors."""
         logger.warning(
             "Unsupported media type.",
-            str(err),
+            error=str(err),
             path=request.path,
             method=request.method,
             request_id=getattr(g, "request_id", None),
@@ -194,7 +194,7 @@ def register_error_handlers(app):
     def internal_error(err):
         logger.error(
             "Internal server error",
-            str(err),
+            error=str(err),
             exc_info=True,
             path=request.path,
             method=request.method,
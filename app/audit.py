@@ -0,0 +1,186 @@
+"""
+audit.py
+--------
+
+Asynchronous audit trail for access denials.
+
+Denials are queued and written by a background thread, so a denied request
+never waits on a database commit. The queue is process-local: each Gunicorn
+worker runs its own writer and flushes it when the worker exits.
+"""
+
+import atexit
+import queue
+import threading
+
+from flask import request, g, current_app
+
+from app.logger import logger
+
+AUDIT_QUEUE_SIZE = 10000
+AUDIT_BATCH_SIZE = 100
+# Seconds the exit hook waits for the writer to flush the queue
+AUDIT_FLUSH_TIMEOUT = 5
+
+# Queued after the last row at exit: the writer flushes and stops
+_STOP = object()
+
+
+def _write_audit_logs(app, rows):
+    """
+    Insert AuditLog rows in a single transaction.
+
+    If the batch fails, its rows are retried one at a time so that a single
+    bad row does not drop the valid ones.
+
+    Args:
+        app (Flask): Application whose database receives the rows.
+        rows (list): Dicts of AuditLog column values.
+    """
+    # pylint: disable=import-outside-toplevel
+    # Imports inside function to avoid circular dependency
+    from app.models.storage import AuditLog
+    from app.models.db import db
+
+    with app.app_context():
+        try:
+            db.session.add_all([AuditLog(**row) for row in rows])
+            db.session.commit()
+            return
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Catch all exceptions so one bad batch never stops the writer
+            db.session.rollback()
+            if len(rows) == 1:
+                logger.error("Failed to log access denial: %s", e)
+                return
+            logger.warning(
+                "Failed to log %d access denials in one batch, "
+                "retrying one by one: %s",
+                len(rows),
+                e,
+            )
+    for row in rows:
+        _write_audit_logs(app, [row])
+
+
+def _write_audit_batch(batch):
+    """Write (app, row) pairs, one transaction per application."""
+    rows_by_app = {}
+    for app, row in batch:
+        rows_by_app.setdefault(app, []).append(row)
+    for app, rows in rows_by_app.items():
+        _write_audit_logs(app, rows)
+
+
+class _AuditWriter:
+    """
+    Background thread writing queued access denials in batches.
+
+    Args:
+        maxsize (int): Maximum number of rows waiting in the queue.
+    """
+
+    def __init__(self, maxsize):
+        # (app, AuditLog column values) pairs waiting to be written
+        self.queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the writer thread on first use."""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="audit-writer", daemon=True
+                    )
+                    self._thread.start()
+                    atexit.register(self.flush)
+
+    def _run(self):
+        """Write queued rows, up to AUDIT_BATCH_SIZE per commit."""
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < AUDIT_BATCH_SIZE and batch[-1] is not _STOP:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _STOP:
+                _write_audit_batch(batch[:-1])
+                return
+            _write_audit_batch(batch)
+
+    def flush(self):
+        """
+        Write the access denials still queued when the process exits.
+
+        The writer is a daemon thread: without this hook, rows still queued
+        when a worker exits would be lost.
+        """
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            try:
+                self.queue.put(_STOP, timeout=AUDIT_FLUSH_TIMEOUT)
+                thread.join(AUDIT_FLUSH_TIMEOUT)
+            except queue.Full:
+                pass
+        # Rows queued after the writer stopped (or if it never caught up)
+        batch = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                batch.append(item)
+        _write_audit_batch(batch)
+
+
+_WRITER = _AuditWriter(AUDIT_QUEUE_SIZE)
+
+
+def log_access_denied(bucket_type, bucket_id, action, reason, file_id=None):
+    """
+    Log an access denial event to audit trail.
+
+    The row is handed to a background writer so the denial response never
+    waits on a database commit. If the queue is full, the row is written
+    synchronously instead.
+
+    Args:
+        bucket_type (str): Type of bucket
+        bucket_id (str): ID of the bucket
+        action (str): Action that was denied
+        reason (str): Reason for denial
+        file_id (str, optional): File ID if applicable
+    """
+    user_id = g.get("user_id", "unknown")
+    row = {
+        "file_id": file_id,  # Can be None
+        "action": "access_denied",
+        "user_id": user_id,
+        "details": {
+            "bucket_type": bucket_type,
+            "bucket_id": bucket_id,
+            "action": action,
+            "reason": reason,
+            "access_denied": True,
+        },
+        "ip_address": request.remote_addr if request else None,
+        "user_agent": request.headers.get("User-Agent") if request else None,
+    }
+    # pylint: disable-next=protected-access
+    app = current_app._get_current_object()
+
+    try:
+        _WRITER.start()
+        _WRITER.queue.put_nowait((app, row))
+    except queue.Full:
+        logger.warning("Audit queue full, logging access denial inline")
+        _write_audit_logs(app, [row])
+
+    logger.info(
+        f"Access denied logged: user={user_id}, bucket={bucket_type}/{bucket_id}, "
+        f"action={action}, reason={reason}"
+    )
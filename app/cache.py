@@ -0,0 +1,129 @@
+"""
+cache.py
+--------
+
+Small in-process caching helpers shared by the service layer.
+
+The caches defined here are process-local: each Gunicorn worker keeps its
+own copy. They are meant for short-lived, read-mostly data (presigned URLs,
+object metadata, authorization decisions) where a few seconds of staleness
+is acceptable.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe mapping with per-entry expiration and LRU eviction.
+
+    Args:
+        maxsize (int): Maximum number of entries kept before the least
+            recently used one is evicted.
+        ttl (float): Default time-to-live in seconds. A value of 0 or less
+            disables the cache (``set`` becomes a no-op).
+    """
+
+    def __init__(self, maxsize=1024, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """bool: True if entries are actually stored."""
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, key, default=None):
+        """
+        Return the value stored for key, or default if missing or expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            deadline, value = entry
+            if deadline <= now:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def get_with_deadline(self, key):
+        """
+        Return ``(value, deadline)`` for key, or None if missing or expired.
+
+        The deadline is expressed on the ``time.monotonic()`` clock.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return None
+            deadline, value = entry
+            if deadline <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value, deadline
+
+    def set(self, key, value, ttl=None):
+        """
+        Store value under key.
+
+        Args:
+            key: Hashable cache key.
+            value: Value to store.
+            ttl (float, optional): Override of the default time-to-live for
+                this entry. Entries with a non-positive ttl are not stored.
+        """
+        if not self.enabled:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        deadline = time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (deadline, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Remove key from the cache and return its value (or default)."""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        return entry[1]
+
+    def remove_if(self, predicate):
+        """
+        Remove every entry whose key satisfies predicate.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
@@ -0,0 +1,72 @@
+"""
+http_session.py
+---------------
+
+Pooled HTTP sessions for calls to the other services (Guardian, project
+service).
+
+Sessions are meant to be built once at import time and shared by every
+request of the worker, so connections are kept alive between calls.
+"""
+
+import os
+import socket
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+
+def keepalive_socket_options():
+    """
+    Socket options enabling TCP keepalive on pooled service connections.
+
+    Idle connections are probed (after HTTP_KEEPALIVE_IDLE seconds) so
+    that sockets silently dropped by a proxy or NAT are detected before an
+    access check tries to reuse them.
+    """
+    idle = int(os.environ.get("HTTP_KEEPALIVE_IDLE", "30"))
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # TCP_KEEP* are not available on every platform
+    for name, value in (
+        ("TCP_KEEPIDLE", idle),
+        ("TCP_KEEPINTVL", max(idle // 3, 1)),
+        ("TCP_KEEPCNT", 3),
+    ):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections use TCP keepalive."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", keepalive_socket_options())
+        super().init_poolmanager(*args, **kwargs)
+
+
+def build_service_session(pool_size, max_retries=0):
+    """
+    Build a pooled HTTP session for access checks against another service.
+
+    Reusing one session keeps connections alive across requests instead of
+    paying a new TCP (and TLS) handshake on every check.
+
+    Args:
+        pool_size (int): Maximum number of connections kept per host.
+        max_retries (int | Retry): Retry policy of the adapter. Defaults
+            to no retries.
+    """
+    adapter = KeepAliveAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=max_retries,
+    )
+    session = requests.Session()
+    # Every access check endpoint answers in JSON
+    session.headers["Accept"] = "application/json"
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,170 @@
+"""
+jwt_auth.py
+-----------
+
+Access token helpers: reading the access_token cookie of the current
+request, forwarding it to other services and verifying the JWT it holds.
+
+Values derived from the request are kept on g for the rest of the
+request; decoded payloads are also cached across requests for a short
+while (JWT_CACHE_TTL).
+"""
+
+import os
+import time
+from functools import lru_cache
+
+import jwt
+from flask import request, g, has_request_context
+
+from app.cache import TTLCache
+from app.logger import logger
+
+# Reusable JWT decoder; access tokens are HS256-signed with JWT_SECRET
+_jwt_decoder = jwt.PyJWT()
+_JWT_ALGORITHMS = ["HS256"]
+
+# Verified token payloads, keyed by (token, secret). An entry never outlives
+# the token's own exp claim.
+_jwt_cache = TTLCache(
+    maxsize=1024, ttl=float(os.environ.get("JWT_CACHE_TTL", "60"))
+)
+
+
+def _access_token():
+    """
+    Return the access_token cookie of the current request.
+
+    The cookie is looked up once per request and kept on g.access_token
+    for the JWT decode and the calls forwarding it to other services. g
+    lives on the app context, which may outlive the request (an app
+    context pushed around several test client calls), so the value is
+    tied to the request it was read from.
+
+    Returns:
+        str: The raw token, or None if absent or outside a request.
+    """
+    if not has_request_context():
+        return None
+    # pylint: disable-next=protected-access
+    current = request._get_current_object()
+    if g.get("access_token_request") is not current:
+        g.access_token = request.cookies.get("access_token")
+        g.access_token_request = current
+    return g.access_token
+
+
+def _forward_headers():
+    """
+    Return the headers forwarding the access_token cookie to a service.
+
+    Built once per request and kept on g.access_token_headers, tied to
+    the request like g.access_token; callers must not modify the
+    returned dict.
+
+    Returns:
+        dict: {"Cookie": "access_token=..."}, or {} without a token.
+    """
+    token = _access_token()
+    if not has_request_context():
+        return {}
+    # pylint: disable-next=protected-access
+    current = request._get_current_object()
+    if g.get("access_token_headers_request") is not current:
+        g.access_token_headers = (
+            {"Cookie": f"access_token={token}"} if token else {}
+        )
+        g.access_token_headers_request = current
+    return g.access_token_headers
+
+
+def extract_jwt_data():
+    """
+    Extract and decode JWT data from request cookies.
+
+    Returns:
+        dict: Dictionary containing user_id and company_id from JWT, or None if invalid/missing
+    """
+    jwt_token = _access_token()
+    if not jwt_token:
+        logger.debug("JWT token not found in cookies")
+        return None
+
+    # The token is decoded (HMAC-verified) at most once per request
+    cached = g.get("jwt_decode_cache")
+    if cached is not None and cached[0] == jwt_token:
+        return cached[1]
+
+    jwt_data = _decode_jwt(jwt_token)
+    g.jwt_decode_cache = (jwt_token, jwt_data)
+    return jwt_data
+
+
+@lru_cache(maxsize=1)
+def _jwt_secret():
+    """
+    Read JWT_SECRET from the environment.
+
+    Evaluated on first use, then reused until reload_config() is called.
+    """
+    return os.environ.get("JWT_SECRET")
+
+
+def _decode_jwt(jwt_token):
+    """
+    Verify and decode a JWT access token.
+
+    Verified payloads are cached for up to JWT_CACHE_TTL seconds (never
+    past the token's exp claim), so a token reused across requests is only
+    HMAC-checked once per window.
+
+    Args:
+        jwt_token (str): Raw token taken from the access_token cookie.
+
+    Returns:
+        dict: Dictionary containing user_id and company_id from JWT, or None if invalid
+    """
+    jwt_secret = _jwt_secret()
+    if not jwt_secret:
+        logger.warning("JWT_SECRET not found in environment variables")
+        return None
+
+    cache_key = (jwt_token, jwt_secret)
+    cached = _jwt_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+
+    try:
+        payload = _jwt_decoder.decode(
+            jwt_token, jwt_secret, algorithms=_JWT_ALGORITHMS
+        )
+        user_id = payload.get("sub") or payload.get("user_id")
+        company_id = payload.get("company_id")
+
+        logger.debug(
+            "JWT decoded successfully - user_id: %s, company_id: %s",
+            user_id,
+            company_id,
+        )
+        jwt_data = {
+            "user_id": user_id,
+            "company_id": company_id,
+            "payload": payload,
+        }
+        exp = payload.get("exp")
+        ttl = (
+            min(exp - time.time(), _jwt_cache.ttl)
+            if isinstance(exp, (int, float))
+            else None
+        )
+        _jwt_cache.set(cache_key, jwt_data, ttl=ttl)
+        return dict(jwt_data)
+    except jwt.ExpiredSignatureError:
+        logger.warning("JWT token expired")
+        return None
+    except jwt.InvalidTokenError as e:
+        logger.warning("Invalid JWT token: %s", e)
+        return None
+    except (ValueError, KeyError) as e:
+        logger.warning("JWT decode failed: %s", e)
+        return None
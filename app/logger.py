@@ -13,6 +13,7 @@ This module configures the application logger using structlog and colorlog.
 Usage:
     from app.logger import logger
     logger.info("Your log message", extra_field="value")
+    logger.debug("Lazy message for %s", user_id)
 """
 
 import os
@@ -55,6 +56,10 @@ else:
 # Configure structlog
 structlog.configure(
     processors=[
+        # Drop records below the stdlib level before any processing, and
+        # only interpolate lazy %-style arguments for records that are kept
+        structlog.stdlib.filter_by_level,
+        structlog.stdlib.PositionalArgumentsFormatter(),
         structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S"),
         structlog.stdlib.add_log_level,
         structlog.processors.StackInfoRenderer(),
@@ -95,7 +95,16 @@ class StorageFile(db.Model):
         db.UniqueConstraint(
             "bucket_type", "bucket_id", "logical_path", name="unique_file_path"
         ),
-        db.Index("idx_files_bucket", "bucket_type", "bucket_id"),
+        # Directory listings: live files under a logical_path prefix
+        db.Index(
+            "idx_files_live",
+            "bucket_type",
+            "bucket_id",
+            "logical_path",
+            postgresql_where=db.text("is_deleted = false"),
+            postgresql_ops={"logical_path": "text_pattern_ops"},
+            sqlite_where=db.text("is_deleted = 0"),
+        ),
         db.Index("idx_files_owner", "owner_id"),
         db.Index("idx_files_status", "status"),
         db.Index("idx_files_updated", "updated_at"),
@@ -376,6 +385,14 @@ class FileVersion(db.Model):
         db.Index("idx_file_versions_status", "status"),
         db.Index("idx_file_versions_created_at", "created_at"),
         db.Index("idx_file_versions_object_key", "object_key"),
+        # Reconciliation scan: index-only pages of non-corrupted versions
+        db.Index(
+            "idx_file_versions_live",
+            "id",
+            postgresql_where=db.text("status <> 'corrupted'"),
+            postgresql_include=["file_id", "object_key"],
+            sqlite_where=db.text("status <> 'corrupted'"),
+        ),
     )
 
     def __repr__(self):
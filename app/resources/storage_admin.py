@@ -13,7 +13,6 @@ from datetime import datetime, timezone
 from flask import request, g
 from flask_restful import Resource
 from marshmallow import ValidationError, Schema, fields
-from minio.error import S3Error
 
 from app.models.db import db
 from app.models.storage import StorageFile, Lock, AuditLog, FileVersion
@@ -23,7 +22,11 @@ from app.schemas.storage_schema import (
     SuccessResponseSchema,
 )
 from app.logger import logger
-from app.utils import require_jwt_auth, check_bucket_access
+from app.utils import (
+    require_jwt_auth,
+    check_bucket_access,
+    check_bucket_access_batch,
+)
 from app.services.storage_service import storage_backend
 
 # Constants
@@ -122,15 +125,12 @@ class FileDeleteResource(Resource):
                 versions = list(file_obj.versions)
                 versions_count = len(versions)
 
-                # Delete all versions from MinIO
-                for version in versions:
-                    try:
-                        storage_backend.delete_object(version.object_key)
-                        physical_deleted = True
-                    except S3Error as e:
-                        logger.warning(
-                            f"Failed to delete object {version.object_key}: {e}"
-                        )
+                # Delete all versions from MinIO in batched requests
+                # (failures are logged by the storage backend)
+                results = storage_backend.delete_objects(
+                    [version.object_key for version in versions]
+                )
+                physical_deleted = any(deleted for _, deleted in results)
 
                 # Log the action for audit BEFORE deleting from DB
                 AuditLog.log_action(
@@ -281,16 +281,21 @@ class LocksListResource(Resource):
             locks = query.all()
 
             # Filter locks based on access (user can only see locks in buckets they have access to)
-            accessible_locks = []
-            for lock in locks:
-                file_obj = lock.file
-                allowed, _, _ = check_bucket_access(
-                    bucket_type=file_obj.bucket_type,
-                    bucket_id=file_obj.bucket_id,
-                    action="read",
-                )
-                if allowed:
-                    accessible_locks.append(lock)
+            # Each bucket is checked once, projects in a single batch call
+            decisions = check_bucket_access_batch(
+                [
+                    (lock.file.bucket_type, lock.file.bucket_id, None)
+                    for lock in locks
+                ],
+                action="read",
+            )
+            accessible_locks = [
+                lock
+                for lock in locks
+                if decisions[
+                    (lock.file.bucket_type, lock.file.bucket_id, None)
+                ][0]
+            ]
 
             # Note: No audit log for list operations as there's no specific file_id
             # and AuditLog requires file_id (nullable=False)
@@ -19,7 +19,6 @@ from flask.views import MethodView
 from flask_restful import Resource
 from marshmallow import ValidationError
 from werkzeug.utils import secure_filename
-from minio.error import S3Error
 
 from app.schemas.storage_schema import (
     PresignedUrlRequestSchema,
@@ -616,6 +615,9 @@ class BucketDownloadProxyResource(Resource):
 
             object_key = current_version.object_key
 
+            # pylint: disable-next=import-outside-toplevel
+            from minio.error import S3Error
+
             # Get object from MinIO
             try:
                 response = storage_backend.get_object(storage_key=object_key)
@@ -184,6 +184,17 @@ class FileCopyResource(Resource, BaseStorageResource):
                 user_id=user_id,
             )
 
+            if copied_file is None:
+                return (
+                    error_schema.dump(
+                        {
+                            "error": "SERVER_ERROR",
+                            "message": "Failed to copy file in storage",
+                        }
+                    ),
+                    500,
+                )
+
             # Log the action
             AuditLog.log_action(
                 file_id=copied_file.id,
@@ -235,6 +246,61 @@ class FileCopyResource(Resource, BaseStorageResource):
                 500,
             )
 
+    def _copy_objects(
+        self,
+        source_file,
+        versions,
+        destination_bucket_type,
+        destination_bucket_id,
+        destination_path,
+        copy_versions,
+    ):
+        """
+        Copy the objects of versions to their destination keys.
+
+        The copies run as one bulk MinIO operation. If any of them fails,
+        the ones that succeeded are deleted again.
+
+        Args:
+            source_file: Source StorageFile object
+            versions: FileVersion objects to copy
+            destination_bucket_type: Destination bucket type
+            destination_bucket_id: Destination bucket ID
+            destination_path: Destination path
+            copy_versions: Whether version numbers are kept (otherwise the
+                single copied version becomes version 1)
+
+        Returns:
+            list: Destination object keys, in versions order, or None if
+            an object could not be copied
+        """
+        new_object_keys = [
+            f"{destination_bucket_type}/{destination_bucket_id}/"
+            f"{destination_path}/"
+            f"{version.version_number if copy_versions else 1}"
+            for version in versions
+        ]
+        results = storage_backend.copy_objects(
+            [
+                (version.object_key, new_object_key)
+                for version, new_object_key in zip(versions, new_object_keys)
+            ]
+        )
+        failed = [src for src, _, copied in results if not copied]
+        if failed:
+            logger.error(
+                "Failed to copy %d object(s) of %s: %s",
+                len(failed),
+                source_file.logical_path,
+                failed,
+            )
+            # Do not leave orphan objects behind for the copies that worked
+            storage_backend.delete_objects(
+                dst for _, dst, copied in results if copied
+            )
+            return None
+        return new_object_keys
+
     def _copy_file(
         self,
         source_file,
@@ -258,8 +324,29 @@ class FileCopyResource(Resource, BaseStorageResource):
             user_id: User performing the copy
 
         Returns:
-            StorageFile: Copied file object
+            StorageFile: Copied file object, or None if an object could not
+            be copied in storage (nothing is written to the database then)
         """
+        if copy_versions:
+            versions = list(source_file.versions)
+        else:
+            # Copy only current version, renumbered as version 1
+            current_version = source_file.get_current_version()
+            versions = [current_version] if current_version else []
+
+        # Copy the objects first: rows are only written once every object
+        # exists
+        new_object_keys = self._copy_objects(
+            source_file,
+            versions,
+            destination_bucket_type,
+            destination_bucket_id,
+            destination_path,
+            copy_versions,
+        )
+        if new_object_keys is None:
+            return None
+
         # Create new file record
         copied_file = StorageFile.create(
             bucket_type=destination_bucket_type,
@@ -274,59 +361,21 @@ class FileCopyResource(Resource, BaseStorageResource):
             source_file_id=source_file.id,
         )
 
-        if copy_versions:
-            # Copy all versions
-            for version in source_file.versions:
-                # Copy the object in MinIO with new key
-                new_object_key = (
-                    f"{destination_bucket_type}/{destination_bucket_id}/"
-                    f"{destination_path}/{version.version_number}"
-                )
-
-                # Copy object in MinIO
-                storage_backend.copy_object(version.object_key, new_object_key)
-
-                # Create new version record
-                new_version = FileVersion.create(
-                    file_id=copied_file.id,
-                    version_number=version.version_number,
-                    object_key=new_object_key,
-                    size=version.size,
-                    mime_type=version.mime_type,
-                    changelog=f"Copied from {source_file.logical_path}",
-                    created_by=user_id,
-                    checksum=version.checksum,
-                )
-
-                # Set as current version if it was current in source
-                if source_file.current_version_id == version.id:
-                    copied_file.current_version_id = new_version.id
-                    db.session.commit()
-        else:
-            # Copy only current version
-            current_version = source_file.get_current_version()
-            if current_version:
-                new_object_key = (
-                    f"{destination_bucket_type}/{destination_bucket_id}/"
-                    f"{destination_path}/1"
-                )
-
-                # Copy object in MinIO
-                storage_backend.copy_object(
-                    current_version.object_key, new_object_key
-                )
-
-                new_version = FileVersion.create(
-                    file_id=copied_file.id,
-                    version_number=1,
-                    object_key=new_object_key,
-                    size=current_version.size,
-                    mime_type=current_version.mime_type,
-                    changelog=f"Copied from {source_file.logical_path}",
-                    created_by=user_id,
-                    checksum=current_version.checksum,
-                )
+        for version, new_object_key in zip(versions, new_object_keys):
+            # Create new version record
+            new_version = FileVersion.create(
+                file_id=copied_file.id,
+                version_number=version.version_number if copy_versions else 1,
+                object_key=new_object_key,
+                size=version.size,
+                mime_type=version.mime_type,
+                changelog=f"Copied from {source_file.logical_path}",
+                created_by=user_id,
+                checksum=version.checksum,
+            )
 
+            # Set as current version if it was current in source
+            if source_file.current_version_id == version.id:
                 copied_file.current_version_id = new_version.id
                 db.session.commit()
 
@@ -7,7 +7,7 @@ Clean Marshmallow schemas for the OpenAPI-compliant storage system.
 
 import uuid
 from datetime import datetime, timezone
-from marshmallow import Schema, fields, ValidationError
+from marshmallow import Schema, fields, validate, ValidationError
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 
 from app.models.storage import StorageFile, FileVersion, Lock, AuditLog
@@ -35,6 +35,29 @@ VALID_AUDIT_ACTIONS = [
     "reject",
     "restore",
 ]
+VALID_VALIDATION_ACTIONS = ["approve", "reject"]
+INVALID_FILENAME_CHARS = '/\\:*?"<>|\0'
+
+# Translation table deleting every forbidden filename character
+_INVALID_FILENAME_TABLE = str.maketrans("", "", INVALID_FILENAME_CHARS)
+
+# Error message of the choice validators
+_CHOICE_ERROR = "Must be one of: {choices}"
+
+
+# Choice validators, built once at import time and shared by every schema
+validate_bucket_type = validate.OneOf(VALID_BUCKET_TYPES, error=_CHOICE_ERROR)
+validate_file_status = validate.OneOf(VALID_FILE_STATUSES, error=_CHOICE_ERROR)
+validate_version_status = validate.OneOf(
+    VALID_VERSION_STATUSES, error=_CHOICE_ERROR
+)
+validate_lock_type = validate.OneOf(VALID_LOCK_TYPES, error=_CHOICE_ERROR)
+validate_audit_action = validate.OneOf(
+    VALID_AUDIT_ACTIONS, error=_CHOICE_ERROR
+)
+validate_validation_action = validate.OneOf(
+    VALID_VALIDATION_ACTIONS, error=_CHOICE_ERROR
+)
 
 
 def validate_uuid(value):
@@ -61,8 +84,7 @@ def validate_filename(value):
     """Validate filename format."""
     if not value or not value.strip():
         raise ValidationError("Filename cannot be empty")
-    invalid_chars = ["/", "\\", ":", "*", "?", '"', "<", ">", "|", "\0"]
-    if any(char in value for char in invalid_chars):
+    if len(value.translate(_INVALID_FILENAME_TABLE)) != len(value):
         raise ValidationError("Filename contains invalid characters")
     return value.strip()
 
@@ -79,14 +101,12 @@ class StorageFileSchema(SQLAlchemyAutoSchema):
         include_fk = True
         dump_only = ("id", "created_at", "updated_at")
 
-    bucket_type = fields.String(
-        required=True, validate=lambda x: x in VALID_BUCKET_TYPES
-    )
+    bucket_type = fields.String(required=True, validate=validate_bucket_type)
     bucket_id = fields.String(required=True, validate=validate_uuid)
     logical_path = fields.String(required=True, validate=validate_path)
     filename = fields.String(required=True, validate=validate_filename)
     owner_id = fields.String(required=True, validate=validate_uuid)
-    status = fields.String(validate=lambda x: x in VALID_FILE_STATUSES)
+    status = fields.String(validate=validate_file_status)
     current_version_id = fields.String(allow_none=True, validate=validate_uuid)
     source_file_id = fields.String(allow_none=True, validate=validate_uuid)
     created_at = fields.DateTime(dump_only=True, format="iso")
@@ -104,7 +124,7 @@ class FileVersionSchema(SQLAlchemyAutoSchema):
 
     file_id = fields.String(required=True, validate=validate_uuid)
     object_key = fields.String(required=True)
-    status = fields.String(validate=lambda x: x in VALID_VERSION_STATUSES)
+    status = fields.String(validate=validate_version_status)
     created_by = fields.String(required=True, validate=validate_uuid)
     validated_by = fields.String(allow_none=True, validate=validate_uuid)
     created_at = fields.DateTime(dump_only=True, format="iso")
@@ -128,7 +148,7 @@ class LockSchema(SQLAlchemyAutoSchema):
     created_at = fields.DateTime(dump_only=True, format="iso")
     updated_at = fields.DateTime(dump_only=True, format="iso")
     expires_at = fields.DateTime(dump_only=True, format="iso", allow_none=True)
-    lock_type = fields.String(validate=lambda x: x in VALID_LOCK_TYPES)
+    lock_type = fields.String(validate=validate_lock_type)
 
 
 class AuditLogSchema(SQLAlchemyAutoSchema):
@@ -143,9 +163,7 @@ class AuditLogSchema(SQLAlchemyAutoSchema):
     file_id = fields.String(required=True, validate=validate_uuid)
     user_id = fields.String(required=True, validate=validate_uuid)
     created_at = fields.DateTime(dump_only=True, format="iso")
-    action = fields.String(
-        required=True, validate=lambda x: x in VALID_AUDIT_ACTIONS
-    )
+    action = fields.String(required=True, validate=validate_audit_action)
 
 
 # Utility Schemas
@@ -188,9 +206,7 @@ class SuccessResponseSchema(Schema):
 class FileListRequestSchema(Schema):
     """Schema for /list endpoint query parameters."""
 
-    bucket = fields.String(
-        required=True, validate=lambda x: x in VALID_BUCKET_TYPES
-    )
+    bucket = fields.String(required=True, validate=validate_bucket_type)
     id = fields.String(required=True, validate=validate_uuid)
     path = fields.String(load_default="")
     page = fields.Integer(load_default=1, validate=lambda x: x >= 1)
@@ -200,21 +216,17 @@ class FileListRequestSchema(Schema):
 class FileListResponseSchema(Schema):
     """Schema for /list endpoint response."""
 
-    files = fields.List(fields.Nested(StorageFileSchema))
+    files = fields.Nested(StorageFileSchema, many=True)
     pagination = fields.Dict(required=True)
 
 
 class FileCopyRequestSchema(Schema):
     """Schema for /copy endpoint request body."""
 
-    source_bucket = fields.String(
-        required=True, validate=lambda x: x in VALID_BUCKET_TYPES
-    )
+    source_bucket = fields.String(required=True, validate=validate_bucket_type)
     source_id = fields.String(required=True, validate=validate_uuid)
     source_path = fields.String(required=True, validate=validate_path)
-    target_bucket = fields.String(
-        required=True, validate=lambda x: x in VALID_BUCKET_TYPES
-    )
+    target_bucket = fields.String(required=True, validate=validate_bucket_type)
     target_id = fields.String(required=True, validate=validate_uuid)
     target_path = fields.String(required=True, validate=validate_path)
     new_filename = fields.String(validate=validate_filename, allow_none=True)
@@ -226,9 +238,7 @@ class LockRequestSchema(Schema):
 
     file_id = fields.String(required=True, validate=validate_uuid)
     reason = fields.String(allow_none=True)
-    lock_type = fields.String(
-        validate=lambda x: x in VALID_LOCK_TYPES, load_default="edit"
-    )
+    lock_type = fields.String(validate=validate_lock_type, load_default="edit")
     expires_in = fields.Integer(allow_none=True, validate=lambda x: x > 0)
 
 
@@ -242,9 +252,7 @@ class UnlockRequestSchema(Schema):
 class FileInfoRequestSchema(Schema):
     """Schema for /metadata endpoint query parameters."""
 
-    bucket = fields.String(
-        required=True, validate=lambda x: x in VALID_BUCKET_TYPES
-    )
+    bucket = fields.String(required=True, validate=validate_bucket_type)
     id = fields.String(required=True, validate=validate_uuid)
     logical_path = fields.String(required=True, validate=validate_path)
     include_versions = fields.Boolean(load_default=False)
@@ -257,9 +265,9 @@ class FileInfoResponseSchema(Schema):
 
     file = fields.Nested(StorageFileSchema)
     current_version = fields.Nested(FileVersionSchema, allow_none=True)
-    versions = fields.List(fields.Nested(FileVersionSchema), allow_none=True)
-    locks = fields.List(fields.Nested(LockSchema), allow_none=True)
-    audit_logs = fields.List(fields.Nested(AuditLogSchema), allow_none=True)
+    versions = fields.Nested(FileVersionSchema, many=True, allow_none=True)
+    locks = fields.Nested(LockSchema, many=True, allow_none=True)
+    audit_logs = fields.Nested(AuditLogSchema, many=True, allow_none=True)
 
 
 class MetadataUpdateRequestSchema(Schema):
@@ -275,9 +283,7 @@ class MetadataUpdateRequestSchema(Schema):
 class PresignedUrlRequestSchema(Schema):
     """Schema for presigned URL requests."""
 
-    bucket_type = fields.String(
-        required=True, validate=lambda x: x in VALID_BUCKET_TYPES
-    )
+    bucket_type = fields.String(required=True, validate=validate_bucket_type)
     bucket_id = fields.String(required=True, validate=validate_uuid)
     logical_path = fields.String(required=True, validate=validate_path)
     expires_in = fields.Integer(
@@ -307,9 +313,7 @@ class VersionListRequestSchema(Schema):
     """Schema for version listing requests (OpenAPI compliant)."""
 
     file_id = fields.String(required=True, validate=validate_uuid)
-    status = fields.String(
-        validate=lambda x: x in VALID_VERSION_STATUSES, allow_none=True
-    )
+    status = fields.String(validate=validate_version_status, allow_none=True)
     limit = fields.Integer(load_default=50, validate=lambda x: 1 <= x <= 200)
     offset = fields.Integer(load_default=0, validate=lambda x: x >= 0)
 
@@ -318,7 +322,7 @@ class VersionListResponseSchema(Schema):
     """Schema for version listing responses (OpenAPI compliant)."""
 
     file_id = fields.String(required=True)
-    versions = fields.List(fields.Nested(FileVersionSchema))
+    versions = fields.Nested(FileVersionSchema, many=True)
     total_count = fields.Integer(required=True)
 
 
@@ -326,7 +330,5 @@ class ValidationRequestSchema(Schema):
     """Schema for validation requests."""
 
     version_id = fields.String(required=True, validate=validate_uuid)
-    action = fields.String(
-        required=True, validate=lambda x: x in ["approve", "reject"]
-    )
+    action = fields.String(required=True, validate=validate_validation_action)
     comment = fields.String(allow_none=True)
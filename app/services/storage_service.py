@@ -6,16 +6,72 @@ This module provides a service layer for MinIO/S3 storage operations.
 It abstracts the storage backend implementation details.
 """
 
+import functools
+import itertools
 import os
-from datetime import datetime, timezone, timedelta
-from typing import Optional, Tuple
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Iterable, List, Optional, Tuple
 from urllib.parse import urlparse
 
-from minio import Minio
-from minio.error import S3Error
-
+from app.cache import TTLCache
 from app.logger import logger
 
+# A cached presigned URL is only handed out again if it stays valid for at
+# least this many seconds, so clients never receive an almost-expired URL.
+PRESIGNED_URL_MIN_REMAINING = 60
+PRESIGNED_URL_CACHE_SIZE = 10000
+
+# Minimum delay in seconds between two bucket existence checks on the
+# upload path.
+BUCKET_CHECK_INTERVAL = 300
+
+# Maximum number of keys accepted by a single S3 DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+
+# Connection pool settings of the MinIO HTTP client
+MINIO_POOL_MAXSIZE = 50
+MINIO_HTTP_TIMEOUT = 300
+
+# Object metadata (HEAD) cache. The TTL can be overridden with
+# STORAGE_META_TTL; 0 disables the cache.
+METADATA_CACHE_TTL = 30
+METADATA_CACHE_SIZE = 100000
+
+# S3 error codes meaning the object does not exist
+_MISSING_OBJECT_CODES = ("NoSuchKey", "NoSuchObject")
+
+# Maximum number of server-side copies run concurrently by copy_objects.
+# Can be overridden with STORAGE_CONCURRENCY.
+STORAGE_CONCURRENCY = 16
+
+# Process-wide thread pool used for bulk copies, shared by every caller so
+# the number of in-flight copies stays bounded by STORAGE_CONCURRENCY no
+# matter how many requests issue bulk operations at once. Worker threads
+# are only started on the first submit.
+_COPY_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(
+        os.environ.get("STORAGE_CONCURRENCY", STORAGE_CONCURRENCY)
+    ),
+    thread_name_prefix="storage-copy",
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _resolve_minio_endpoint(minio_url: str) -> Tuple[str, bool]:
+    """
+    Parse the MinIO service URL into a client endpoint.
+
+    Args:
+        minio_url (str): Value of MINIO_SERVICE_URL.
+
+    Returns:
+        tuple: ("host:port", secure) as expected by the Minio client.
+    """
+    parsed = urlparse(minio_url)
+    return f"{parsed.hostname}:{parsed.port or 9000}", parsed.scheme == "https"
+
 
 class StorageBackendService:
     """
@@ -23,6 +79,13 @@ class StorageBackendService:
     """
 
     def __init__(self):
+        # pylint: disable=import-outside-toplevel
+        # minio (and its urllib3/pycryptodome tree) is only imported once a
+        # backend is actually built, keeping it off the cold-start path
+        import certifi
+        import urllib3
+        from minio import Minio
+
         # Configuration
         default_minio_url = "http://localhost:9000"
         minio_url = os.environ.get("MINIO_SERVICE_URL", default_minio_url)
@@ -31,32 +94,67 @@ class StorageBackendService:
         self.bucket_name = os.environ.get("MINIO_BUCKET_NAME", "storage")
         self.default_expiry = 3600  # 1 hour
 
+        # Presigned URLs are deterministic for a given key and expiry, so
+        # identical requests reuse the signed URL instead of re-signing it.
+        self._url_cache = TTLCache(
+            maxsize=PRESIGNED_URL_CACHE_SIZE, ttl=self.default_expiry
+        )
+        # Monotonic timestamp of the last successful bucket check
+        self._bucket_verified_at = None
+        # stat_object results, so hot keys skip the HEAD round-trip. Entries
+        # are dropped whenever this service copies, moves or deletes them.
+        self._metadata_cache = TTLCache(
+            maxsize=METADATA_CACHE_SIZE,
+            ttl=float(os.environ.get("STORAGE_META_TTL", METADATA_CACHE_TTL)),
+        )
+
         # Public URL for storage service (not MinIO directly)
         self.public_url = os.environ.get(
             "STORAGE_PUBLIC_URL", "http://localhost:5000"
         )
 
         # Single MinIO client using hostname from environment
-        parsed = urlparse(minio_url)
-        minio_endpoint = f"{parsed.hostname}:{parsed.port or 9000}"
+        minio_endpoint, secure = _resolve_minio_endpoint(minio_url)
 
         logger.info(
-            f"Initializing MinIO client - endpoint: {minio_endpoint}, "
-            f"bucket: {self.bucket_name}"
+            "Initializing MinIO client - endpoint: %s, bucket: %s",
+            minio_endpoint,
+            self.bucket_name,
+        )
+
+        # Same settings as the minio default client, with a larger pool so
+        # concurrent requests reuse warm connections instead of opening
+        # (and TLS-handshaking) new ones once the default 10 are busy.
+        http_client = urllib3.PoolManager(
+            timeout=urllib3.Timeout(
+                connect=MINIO_HTTP_TIMEOUT, read=MINIO_HTTP_TIMEOUT
+            ),
+            maxsize=int(
+                os.environ.get("MINIO_POOL_MAXSIZE", MINIO_POOL_MAXSIZE)
+            ),
+            cert_reqs="CERT_REQUIRED",
+            ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+            retries=urllib3.Retry(
+                total=5,
+                backoff_factor=0.2,
+                status_forcelist=[500, 502, 503, 504],
+            ),
         )
 
         self.minio_client = Minio(
             minio_endpoint,
             access_key=access_key,
             secret_key=secret_key,
-            secure=(parsed.scheme == "https"),
+            secure=secure,
+            http_client=http_client,
         )
 
         # Ensure bucket exists at startup (best-effort)
         # Skip if in testing mode without MinIO available
         if os.environ.get("FLASK_ENV") != "testing":
             try:
-                self._ensure_bucket_exists()
+                if self._ensure_bucket_exists():
+                    self._bucket_verified_at = time.monotonic()
             except Exception:  # pylint: disable=broad-exception-caught
                 # _ensure_bucket_exists already logs errors; swallow to allow app to start
                 pass
@@ -64,25 +162,85 @@ class StorageBackendService:
     def _ensure_bucket_exists(self):
         """
         Ensure the configured bucket exists, create it if not.
+
+        Returns:
+            bool: True if the bucket is known to exist, False otherwise.
         """
+        # pylint: disable-next=import-outside-toplevel
+        from minio.error import S3Error
+
         try:
-            logger.debug(f"Checking if bucket '{self.bucket_name}' exists")
+            logger.debug("Checking if bucket '%s' exists", self.bucket_name)
             if not self.minio_client.bucket_exists(self.bucket_name):
                 logger.info(
-                    f"Bucket '{self.bucket_name}' does not exist, creating it..."
+                    "Bucket '%s' does not exist, creating it...",
+                    self.bucket_name,
                 )
                 self.minio_client.make_bucket(self.bucket_name)
                 logger.info(
-                    f"Successfully created bucket '{self.bucket_name}'"
+                    "Successfully created bucket '%s'", self.bucket_name
                 )
             else:
-                logger.info(f"Bucket '{self.bucket_name}' already exists")
+                logger.info("Bucket '%s' already exists", self.bucket_name)
+            return True
         except S3Error as exc:
             logger.error(
-                f"Failed to ensure bucket '{self.bucket_name}' exists: {exc}",
+                "Failed to ensure bucket '%s' exists: %s",
+                self.bucket_name,
+                exc,
                 exc_info=True,
             )
             # Don't raise - let the service start, bucket will be created on first use
+            return False
+
+    def _ensure_bucket_verified(self):
+        """
+        Check the bucket at most once per BUCKET_CHECK_INTERVAL seconds.
+
+        A failed check is not remembered, so the next call verifies again.
+        """
+        now = time.monotonic()
+        if (
+            self._bucket_verified_at is not None
+            and now - self._bucket_verified_at <= BUCKET_CHECK_INTERVAL
+        ):
+            return
+        self._bucket_verified_at = (
+            now if self._ensure_bucket_exists() else None
+        )
+
+    def _get_cached_url(self, cache_key) -> Optional[Tuple[str, int]]:
+        """
+        Return a cached presigned URL and its remaining lifetime, if any.
+
+        Args:
+            cache_key (tuple): Key identifying the presigned operation.
+
+        Returns:
+            tuple: (presigned_url, remaining_seconds) or None on cache miss.
+        """
+        cached = self._url_cache.get_with_deadline(cache_key)
+        if cached is None:
+            return None
+        presigned_url, cache_deadline = cached
+        # The entry expires PRESIGNED_URL_MIN_REMAINING seconds before the URL
+        remaining = cache_deadline - time.monotonic()
+        return presigned_url, int(remaining + PRESIGNED_URL_MIN_REMAINING)
+
+    def _cache_url(self, cache_key, presigned_url: str, expiry: int):
+        """
+        Store a freshly signed URL until it gets close to its expiration.
+
+        Args:
+            cache_key (tuple): Key identifying the presigned operation.
+            presigned_url (str): URL returned by MinIO.
+            expiry (int): Validity of the URL in seconds.
+        """
+        self._url_cache.set(
+            cache_key,
+            presigned_url,
+            ttl=expiry - PRESIGNED_URL_MIN_REMAINING,
+        )
 
     def generate_upload_url(
         self,
@@ -99,8 +257,14 @@ class StorageBackendService:
         Returns:
             tuple: (presigned_url, expires_in_seconds)
         """
-        # Ensure bucket exists (in case it was deleted)
-        self._ensure_bucket_exists()
+        cache_key = ("put", storage_key, self.default_expiry)
+        cached = self._get_cached_url(cache_key)
+        if cached:
+            return cached
+
+        # Ensure bucket exists (in case it was deleted), without paying a
+        # MinIO round-trip on every upload
+        self._ensure_bucket_verified()
 
         # Generate presigned PUT URL
         presigned_url = self.minio_client.presigned_put_object(
@@ -108,6 +272,7 @@ class StorageBackendService:
             object_name=storage_key,
             expires=timedelta(seconds=self.default_expiry),
         )
+        self._cache_url(cache_key, presigned_url, self.default_expiry)
 
         return presigned_url, self.default_expiry
 
@@ -126,12 +291,18 @@ class StorageBackendService:
         """
         expiry = expires_in or self.default_expiry
 
+        cache_key = ("get", storage_key, expiry)
+        cached = self._get_cached_url(cache_key)
+        if cached:
+            return cached
+
         # Generate presigned GET URL
         presigned_url = self.minio_client.presigned_get_object(
             bucket_name=self.bucket_name,
             object_name=storage_key,
             expires=timedelta(seconds=expiry),
         )
+        self._cache_url(cache_key, presigned_url, expiry)
 
         return presigned_url, expiry
 
@@ -149,19 +320,40 @@ class StorageBackendService:
             bucket_name=self.bucket_name, object_name=storage_key
         )
 
-    def copy_object(self, _source_key: str, _destination_key: str) -> bool:
+    def copy_object(self, source_key: str, destination_key: str) -> bool:
         """
         Copy an object in storage.
 
+        The copy is performed server-side by MinIO, so the object bytes never
+        transit this service. Objects larger than 5 GiB are transparently
+        copied part by part (UploadPartCopy) by the MinIO client.
+
         Args:
-            _source_key (str): Source storage key.
-            _destination_key (str): Destination storage key.
+            source_key (str): Source storage key.
+            destination_key (str): Destination storage key.
 
         Returns:
             bool: True if successful, False otherwise.
         """
-        # In production, this would use boto3 or minio-py to copy objects
-        # For now, just return True to simulate success
+        # pylint: disable=import-outside-toplevel
+        from minio.commonconfig import CopySource
+        from minio.error import S3Error
+        from urllib3.exceptions import HTTPError
+
+        self._metadata_cache.pop(destination_key)
+        try:
+            self.minio_client.copy_object(
+                self.bucket_name,
+                destination_key,
+                CopySource(self.bucket_name, source_key),
+            )
+        # Connection and timeout errors are failures of this copy too:
+        # copy_objects must get a result for every pair
+        except (S3Error, HTTPError, OSError) as exc:
+            logger.error(
+                "Failed to copy %s to %s: %s", source_key, destination_key, exc
+            )
+            return False
         return True
 
     def move_object(self, source_key: str, destination_key: str) -> bool:
@@ -175,58 +367,175 @@ class StorageBackendService:
         Returns:
             bool: True if successful, False otherwise.
         """
-        # In production, this would copy then delete the source
-        if self.copy_object(source_key, destination_key):
-            return self.delete_object(source_key)
-        return False
+        if not self.copy_object(source_key, destination_key):
+            return False
+        if not self.delete_object(source_key):
+            logger.error(
+                "Copied %s to %s but failed to remove the source",
+                source_key,
+                destination_key,
+            )
+            return False
+        return True
+
+    def copy_objects(
+        self, pairs: Iterable[Tuple[str, str]]
+    ) -> List[Tuple[str, str, bool]]:
+        """
+        Copy several objects, running the server-side copies concurrently.
 
-    def delete_object(self, _storage_key: str) -> bool:
+        Args:
+            pairs (iterable): (source_key, destination_key) tuples.
+
+        Returns:
+            list: (source_key, destination_key, copied) tuples, in input
+            order.
+        """
+        pairs = list(pairs)
+        if len(pairs) <= 1:
+            return [
+                (src, dst, self.copy_object(src, dst)) for src, dst in pairs
+            ]
+
+        futures = [
+            _COPY_EXECUTOR.submit(self.copy_object, src, dst)
+            for src, dst in pairs
+        ]
+        return [
+            (src, dst, future.result())
+            for (src, dst), future in zip(pairs, futures)
+        ]
+
+    def move_objects(
+        self, pairs: Iterable[Tuple[str, str]]
+    ) -> List[Tuple[str, str, bool]]:
+        """
+        Move several objects: concurrent copies, then one batched delete.
+
+        Sources are only deleted once their copy succeeded.
+
+        Args:
+            pairs (iterable): (source_key, destination_key) tuples.
+
+        Returns:
+            list: (source_key, destination_key, moved) tuples, in input
+            order.
+        """
+        copied = self.copy_objects(pairs)
+        deleted = dict(self.delete_objects(src for src, _, ok in copied if ok))
+        return [
+            (src, dst, ok and deleted.get(src, False))
+            for src, dst, ok in copied
+        ]
+
+    def delete_object(self, storage_key: str) -> bool:
         """
         Delete an object from storage.
 
         Args:
-            _storage_key (str): Storage key of the file to delete.
+            storage_key (str): Storage key of the file to delete.
 
         Returns:
             bool: True if successful, False otherwise.
         """
-        # In production, this would use boto3 or minio-py to delete objects
-        # For now, just return True to simulate success
-        return True
+        return self.delete_objects([storage_key])[0][1]
 
-    def object_exists(self, _storage_key: str) -> bool:
+    def delete_objects(
+        self, storage_keys: Iterable[str]
+    ) -> List[Tuple[str, bool]]:
+        """
+        Delete several objects with batched S3 DeleteObjects requests.
+
+        Keys are sent in chunks of DELETE_BATCH_SIZE, so deleting N objects
+        costs ceil(N / 1000) round-trips instead of N.
+
+        Args:
+            storage_keys (iterable): Storage keys of the objects to delete.
+
+        Returns:
+            list: (storage_key, deleted) tuples, in input order.
+        """
+        # pylint: disable=import-outside-toplevel
+        from minio.deleteobjects import DeleteObject
+        from minio.error import S3Error
+
+        results = []
+        keys = iter(storage_keys)
+        while True:
+            chunk = list(itertools.islice(keys, DELETE_BATCH_SIZE))
+            if not chunk:
+                break
+            for key in chunk:
+                self._metadata_cache.pop(key)
+            failed = {}
+            try:
+                # remove_objects is lazy: errors only surface while draining
+                for error in self.minio_client.remove_objects(
+                    self.bucket_name, (DeleteObject(key) for key in chunk)
+                ):
+                    failed[error.name] = error.message or error.code
+            except S3Error as exc:
+                logger.error(
+                    "Failed to delete %d objects: %s", len(chunk), exc
+                )
+                failed = dict.fromkeys(chunk, str(exc))
+            for key in chunk:
+                reason = failed.get(key)
+                if reason is not None:
+                    logger.warning(
+                        "Failed to delete object %s: %s", key, reason
+                    )
+                results.append((key, reason is None))
+        return results
+
+    def object_exists(self, storage_key: str) -> bool:
         """
         Check if an object exists in storage.
 
         Args:
-            _storage_key (str): Storage key to check.
+            storage_key (str): Storage key to check.
 
         Returns:
             bool: True if exists, False otherwise.
         """
-        # In production, this would check if the object exists
-        # For now, just return True to simulate existence
-        return True
+        return self.get_object_metadata(storage_key) is not None
 
     def get_object_metadata(self, storage_key: str) -> Optional[dict]:
         """
         Get metadata for an object.
 
+        Results are cached for STORAGE_META_TTL seconds. Missing objects are
+        not cached, so an object uploaded through a presigned URL is visible
+        immediately.
+
         Args:
             storage_key (str): Storage key of the object.
 
         Returns:
             dict: Object metadata or None if not found.
         """
-        # In production, this would return actual metadata
-        if self.object_exists(storage_key):
-            return {
-                "size": 1024,  # Mock size
-                "last_modified": datetime.now(timezone.utc),
-                "content_type": "application/octet-stream",
-                "etag": f"mock-etag-{storage_key}",
-            }
-        return None
+        metadata = self._metadata_cache.get(storage_key)
+        if metadata is not None:
+            return dict(metadata)
+
+        # pylint: disable-next=import-outside-toplevel
+        from minio.error import S3Error
+
+        try:
+            stat = self.minio_client.stat_object(self.bucket_name, storage_key)
+        except S3Error as exc:
+            if exc.code not in _MISSING_OBJECT_CODES:
+                logger.error("Failed to stat object %s: %s", storage_key, exc)
+            return None
+
+        metadata = {
+            "size": stat.size,
+            "content_type": stat.content_type,
+            "last_modified": stat.last_modified,
+            "etag": stat.etag,
+        }
+        self._metadata_cache.set(storage_key, metadata)
+        return dict(metadata)
 
 
 class _LazyStorageBackendProxy:
@@ -1,70 +1,144 @@
 """Utility functions for the Identity Service API."""
 
+import hashlib
 import os
 import re
-import uuid
-from functools import wraps
-import jwt
+from collections import namedtuple
+from functools import lru_cache, wraps
 from flask import request, g, current_app
+from werkzeug.exceptions import BadRequest
 import requests
-
+from urllib3.util.retry import Retry
+
+from app.audit import log_access_denied
+from app.cache import TTLCache
+from app.http_session import build_service_session
+from app.jwt_auth import (
+    _access_token,
+    _forward_headers,
+    _jwt_secret,
+    extract_jwt_data,
+)
 from app.logger import logger
 
-
+# Sentinel telling "attribute not set on g" apart from a None value
+_MISSING = object()
+
+
+# Guardian checks are retried on connection failures and 502/503/504 only.
+# read=False re-raises read timeouts as-is: they are reported as 504 and
+# never wait for more than one timeout.
+_GUARDIAN_RETRY = Retry(
+    total=2,
+    read=False,
+    backoff_factor=0.1,
+    status_forcelist=[502, 503, 504],
+    # Access checks are read-only queries, safe to retry
+    allowed_methods=frozenset({"POST"}),
+    # Hand the last response back instead of raising RetryError
+    raise_on_status=False,
+)
+
+_guardian_session = build_service_session(
+    int(os.environ.get("GUARDIAN_POOL", "50")), max_retries=_GUARDIAN_RETRY
+)
+# The project service is called without retries: a timeout is reported
+# as such and the per-call timeout is never multiplied.
+_project_session = build_service_session(
+    int(os.environ.get("PROJECT_SERVICE_POOL", "50"))
+)
+
+# Granted Guardian decisions, keyed by (user_id, resource_name, operation,
+# token digest). Denials and errors are never cached.
+_access_cache = TTLCache(
+    maxsize=10000, ttl=float(os.environ.get("GUARDIAN_CACHE_TTL", "5"))
+)
+
+
+# Canonical 8-4-4-4-12 hexadecimal UUID string
+_UUID_RE = re.compile(
+    r"\A[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-"
+    r"[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z"
+)
+_CAMEL_WORD_RE = re.compile(r"(.)([A-Z][a-z]+)")
+_CAMEL_BOUNDARY_RE = re.compile(r"([a-z0-9])([A-Z])")
+_UNDERSCORES_RE = re.compile(r"_+")
+
+
+@lru_cache(maxsize=1024)
 def camel_to_snake(name):
     """
     Convert a CamelCase or PascalCase string to snake_case.
 
+    Results are memoized: callers convert resource class names, a small and
+    bounded set.
+
     Args:
         name (str): The string to convert.
 
     Returns:
         str: The converted snake_case string.
     """
-    s1 = re.sub(r"(.)([A-Z][a-z]+)", r"\1_\2", name)
-    snake = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
-    return re.sub(r"_+", "_", snake)
+    # Already snake_case: no regex pass can change the string
+    if name.islower() and "__" not in name:
+        return name
+    s1 = _CAMEL_WORD_RE.sub(r"\1_\2", name)
+    snake = _CAMEL_BOUNDARY_RE.sub(r"\1_\2", s1).lower()
+    return _UNDERSCORES_RE.sub("_", snake)
 
 
-def extract_jwt_data():
+class _LazyJSON:
     """
-    Extract and decode JWT data from request cookies.
-
-    Returns:
-        dict: Dictionary containing user_id and company_id from JWT, or None if invalid/missing
+    Request JSON body parsed on first access.
+
+    Behaves like the parsed body (dict-style access, truthiness, iteration)
+    but only calls ``request.get_json`` when the data is actually read, so
+    views that never look at ``g.json_data`` never pay for the parse. Flask
+    caches the parsed body, so later ``request.get_json()`` calls are free.
+    Invalid JSON reads as None; use ``malformed()`` to tell it apart from a
+    body that is actually empty.
     """
-    jwt_token = request.cookies.get("access_token")
-    if not jwt_token:
-        logger.debug("JWT token not found in cookies")
-        return None
 
-    jwt_secret = os.environ.get("JWT_SECRET")
-    if not jwt_secret:
-        logger.warning("JWT_SECRET not found in environment variables")
-        return None
+    __slots__ = ()
 
-    try:
-        payload = jwt.decode(jwt_token, jwt_secret, algorithms=["HS256"])
-        user_id = payload.get("sub") or payload.get("user_id")
-        company_id = payload.get("company_id")
+    @staticmethod
+    def _data():
+        return request.get_json(silent=True)
 
-        logger.debug(
-            f"JWT decoded successfully - user_id: {user_id}, company_id: {company_id}"
-        )
-        return {
-            "user_id": user_id,
-            "company_id": company_id,
-            "payload": payload,
-        }
-    except jwt.ExpiredSignatureError:
-        logger.warning("JWT token expired")
-        return None
-    except jwt.InvalidTokenError as e:
-        logger.warning(f"Invalid JWT token: {e}")
-        return None
-    except (ValueError, KeyError) as e:
-        logger.warning(f"JWT decode failed: {e}")
-        return None
+    @staticmethod
+    def malformed():
+        """Return True if the body is present but is not valid JSON."""
+        if request.get_json(silent=True) is not None:
+            return False
+        # Only reached for a None result: parse strictly to find out why
+        try:
+            request.get_json()
+        except BadRequest:
+            return True
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self._data(), name)
+
+    def __bool__(self):
+        return bool(self._data())
+
+    def __contains__(self, key):
+        return key in self._data()
+
+    def __getitem__(self, key):
+        return self._data()[key]
+
+    def __iter__(self):
+        return iter(self._data())
+
+    def __len__(self):
+        return len(self._data())
+
+    def __eq__(self, other):
+        return self._data() == other
+
+    __hash__ = None
 
 
 def require_jwt_auth():
@@ -82,7 +156,9 @@ def require_jwt_auth():
         - g.user_id: User ID from JWT
         - g.company_id: Company ID from JWT
         - g.jwt_data: Complete JWT payload
-        - g.json_data: Original request JSON data (unmodified)
+        - g.access_token: Raw access_token cookie (None if absent)
+        - g.json_data: Original request JSON data (unmodified, parsed on
+          first access; None for non-JSON requests)
     """
 
     def decorator(view_func):
@@ -119,10 +195,13 @@ def require_jwt_auth():
                     "message": "Invalid JWT token: missing company_id"
                 }, 401
 
-            # Validate UUID format for company_id
-            try:
-                uuid.UUID(company_id)
-            except (ValueError, TypeError):
+            # Validate UUID format for company_id (a canonical UUID is
+            # always 36 characters long)
+            if not (
+                isinstance(company_id, str)
+                and len(company_id) == 36
+                and _UUID_RE.match(company_id)
+            ):
                 logger.error(f"Invalid company_id format in JWT: {company_id}")
                 return {
                     "message": "Invalid JWT token: company_id must be a valid UUID"
@@ -134,18 +213,10 @@ def require_jwt_auth():
             g.jwt_data = jwt_data
 
             # Store original JSON data in g without modification
-            # Only parse JSON if Content-Type is application/json
-            try:
-                if (
-                    request.content_length
-                    and request.content_length > 0
-                    and request.content_type
-                    and "application/json" in request.content_type
-                ):
-                    g.json_data = request.get_json()
-                else:
-                    g.json_data = None
-            except (ValueError, TypeError, RuntimeError):
+            # Only JSON bodies qualify, and they are parsed on first access
+            if request.content_length and request.is_json:
+                g.json_data = _LazyJSON()
+            else:
                 g.json_data = None
 
             return view_func(*args, **kwargs)
@@ -166,10 +237,9 @@ def check_access_required(operation):
     def decorator(view_func):
         @wraps(view_func)
         def wrapped(*args, **kwargs):
+            view_args = request.view_args
             resource_name = kwargs.get("resource_name") or (
-                request.view_args.get("resource_name")
-                if request.view_args
-                else None
+                view_args.get("resource_name") if view_args else None
             )
             # If not found, deduce from the resource class name
             if not resource_name:
@@ -182,13 +252,14 @@ def check_access_required(operation):
             # Normalisation: si resource_name se termine par '_list', on retire ce suffixe
             if resource_name and resource_name.endswith("_list"):
                 resource_name = resource_name[:-5]
-            user_id = getattr(g, "user_id", None)
+            user_id = g.get("user_id")
+            jwt_data = g.get("jwt_data")
 
             # Essayer d'utiliser les données JWT déjà décodées si disponibles
-            if not user_id and hasattr(g, "jwt_data") and g.jwt_data:
-                user_id = g.jwt_data.get("user_id")
+            if not user_id and jwt_data:
+                user_id = jwt_data.get("user_id")
                 logger.debug(
-                    f"Using user_id from already decoded JWT: {user_id}"
+                    "Using user_id from already decoded JWT: %s", user_id
                 )
             # Sinon, extraire user_id du cookie JWT
             elif not user_id:
@@ -197,8 +268,11 @@ def check_access_required(operation):
                 )
                 jwt_data = extract_jwt_data()
                 if jwt_data:
+                    # Share the decoded token with the view, as
+                    # require_jwt_auth does
+                    g.jwt_data = jwt_data
                     user_id = jwt_data.get("user_id")
-                    logger.debug(f"Extracted user_id from JWT: {user_id}")
+                    logger.debug("Extracted user_id from JWT: %s", user_id)
                 else:
                     logger.warning("JWT token not found or invalid")
             if not user_id or not resource_name:
@@ -223,6 +297,57 @@ def check_access_required(operation):
     return decorator
 
 
+_GuardianSettings = namedtuple(
+    "_GuardianSettings", ["bypass", "check_url", "timeout"]
+)
+
+
+@lru_cache(maxsize=1)
+def _guardian_settings():
+    """
+    Read the Guardian settings used by check_access from the environment.
+
+    Evaluated on first use, once .env files have been loaded, then reused
+    for the lifetime of the process.
+
+    Returns:
+        _GuardianSettings: bypass (True in testing/development), the
+        /check-access URL (None if GUARDIAN_SERVICE_URL is unset) and the
+        request timeout in seconds.
+    """
+    flask_env = os.environ.get("FLASK_ENV", "production").lower()
+    guardian_service_url = os.environ.get("GUARDIAN_SERVICE_URL")
+    return _GuardianSettings(
+        bypass=flask_env in ("testing", "development"),
+        check_url=(
+            f"{guardian_service_url}/check-access"
+            if guardian_service_url
+            else None
+        ),
+        timeout=float(os.environ.get("GUARDIAN_SERVICE_TIMEOUT", "5")),
+    )
+
+
+def reload_config():
+    """Re-read the Guardian settings and JWT secret from the environment."""
+    _guardian_settings.cache_clear()
+    _jwt_secret.cache_clear()
+
+
+def invalidate_access_cache(user_id=None):
+    """
+    Forget cached Guardian decisions after a permission change.
+
+    Args:
+        user_id (str, optional): Only drop this user's decisions. All
+            decisions are dropped when omitted.
+    """
+    if user_id is None:
+        _access_cache.clear()
+    else:
+        _access_cache.remove_if(lambda key: key[0] == user_id)
+
+
 def check_access(user_id, resource_name, operation):
     """
     Check if the user has access to perform the operation on the resource.
@@ -235,38 +360,45 @@ def check_access(user_id, resource_name, operation):
         tuple: (access_granted (bool), reason (str), status (int or str))
     """
     logger.debug(
-        f"Checking access for user_id: {user_id}, "
-        f"resource_name: {resource_name}, operation: {operation}"
+        "Checking access for user_id: %s, resource_name: %s, operation: %s",
+        user_id,
+        resource_name,
+        operation,
     )
 
-    flask_env = os.environ.get("FLASK_ENV", "production").lower()
-    if flask_env in ["testing", "development"]:
+    settings = _guardian_settings()
+    if settings.bypass:
         logger.debug("check_access: testing/development environment")
         return True, "Access granted in testing/development environment.", 200
 
-    guardian_service_url = os.environ.get("GUARDIAN_SERVICE_URL")
-    if not guardian_service_url:
+    if not settings.check_url:
         logger.error("GUARDIAN_SERVICE_URL not set")
         return False, "Internal server error", 500
 
-    try:
-        timeout = float(os.environ.get("GUARDIAN_SERVICE_TIMEOUT", "5"))
-
-        # Get JWT token from cookies to forward to Guardian service (if in request context)
-        headers = {}
-        try:
-            jwt_token = request.cookies.get("access_token")
-            if jwt_token:
-                headers["Cookie"] = f"access_token={jwt_token}"
-                logger.debug("Forwarding JWT cookie to Guardian service")
-        except RuntimeError:
-            # No request context available (e.g., during testing without Flask app context)
-            logger.debug(
-                "No request context available, skipping JWT cookie forwarding"
-            )
+    # Get JWT token from cookies to forward to Guardian service (no request
+    # context when called from the CLI or tests)
+    headers = {}
+    jwt_token = _access_token()
+    if jwt_token:
+        headers = _forward_headers()
+        logger.debug("Forwarding JWT cookie to Guardian service")
+
+    # The token is part of the key so a new (or expired) token never reuses
+    # a decision made for another one
+    cache_key = (
+        user_id,
+        resource_name,
+        operation,
+        hashlib.sha256(jwt_token.encode()).hexdigest() if jwt_token else None,
+    )
+    cached = _access_cache.get(cache_key)
+    if cached is not None:
+        logger.debug("check_access: using cached Guardian decision")
+        return cached
 
-        response = requests.post(
-            f"{guardian_service_url}/check-access",
+    try:
+        response = _guardian_session.post(
+            settings.check_url,
             json={
                 "user_id": user_id,
                 "service": "identity",
@@ -274,24 +406,27 @@ def check_access(user_id, resource_name, operation):
                 "operation": operation,
             },
             headers=headers,
-            timeout=timeout,
+            timeout=settings.timeout,
         )
 
         # Don't raise_for_status() immediately - check the response first
         if response.status_code == 200:
             response_data = response.json()
-            logger.debug(f"Guardian service response: {response_data}")
-            return (
+            logger.debug("Guardian service response: %s", response_data)
+            result = (
                 response_data.get("access_granted", False),
                 response_data.get("reason", "Unknown error"),
                 response_data.get("status", 200),
             )
+            if result[0] is True:
+                _access_cache.set(cache_key, result)
+            return result
         if response.status_code == 400:
             # Guardian service returned a 400 with detailed error message
             try:
                 response_data = response.json()
                 logger.warning(
-                    f"Guardian service returned 400: {response_data}"
+                    "Guardian service returned 400: %s", response_data
                 )
                 return (
                     response_data.get("access_granted", False),
@@ -324,6 +459,57 @@ def check_access(user_id, resource_name, operation):
         return False, "Internal server error", 500
 
 
+# pylint: disable-next=unused-argument
+def _check_users_bucket(bucket_id, action, file_id):
+    """Users bucket: user can only access their own directory."""
+    user_id = g.user_id
+    if bucket_id != user_id:
+        logger.warning(
+            "Access denied: user %s tried to access users/%s",
+            user_id,
+            bucket_id,
+        )
+        return (
+            False,
+            "Access denied: cannot access other users' files",
+            403,
+        )
+    return True, None, 200
+
+
+# pylint: disable-next=unused-argument
+def _check_companies_bucket(bucket_id, action, file_id):
+    """Companies bucket: user must belong to the company."""
+    company_id = g.company_id
+    if bucket_id != company_id:
+        logger.warning(
+            "Access denied: user %s (company %s) "
+            "tried to access companies/%s",
+            g.user_id,
+            company_id,
+            bucket_id,
+        )
+        return (
+            False,
+            "Access denied: cannot access other companies' files",
+            403,
+        )
+    return True, None, 200
+
+
+def _check_projects_bucket(bucket_id, action, file_id):
+    """Projects bucket: delegate to project service."""
+    return check_project_access(bucket_id, action, file_id)
+
+
+# Access rule for each bucket type
+_BUCKET_HANDLERS = {
+    "users": _check_users_bucket,
+    "companies": _check_companies_bucket,
+    "projects": _check_projects_bucket,
+}
+
+
 def check_bucket_access(bucket_type, bucket_id, action="read", file_id=None):
     """
     Verify user has access to a bucket based on bucket type.
@@ -337,52 +523,99 @@ def check_bucket_access(bucket_type, bucket_id, action="read", file_id=None):
     Returns:
         tuple: (allowed (bool), error_message (str or None), status_code (int))
     """
-    user_id = g.user_id
-    company_id = g.company_id
-
     logger.debug(
-        f"Checking bucket access - type: {bucket_type}, id: {bucket_id}, "
-        f"action: {action}, user: {user_id}, company: {company_id}"
+        "Checking bucket access - type: %s, id: %s, action: %s, user: %s, "
+        "company: %s",
+        bucket_type,
+        bucket_id,
+        action,
+        g.user_id,
+        g.company_id,
     )
 
-    # Validate bucket_type
-    if bucket_type not in ["users", "companies", "projects"]:
+    handler = _BUCKET_HANDLERS.get(bucket_type)
+    if handler is None:
         return False, f"Invalid bucket_type: {bucket_type}", 400
+    return handler(bucket_id, action, file_id)
 
-    # Users bucket: user can only access their own directory
-    if bucket_type == "users":
-        allowed = bucket_id == user_id
-        if not allowed:
-            logger.warning(
-                f"Access denied: user {user_id} tried to access users/{bucket_id}"
-            )
-            return (
-                False,
-                "Access denied: cannot access other users' files",
-                403,
-            )
-        return True, None, 200
 
-    # Companies bucket: user must belong to the company
-    if bucket_type == "companies":
-        allowed = bucket_id == company_id
-        if not allowed:
-            logger.warning(
-                f"Access denied: user {user_id} (company {company_id}) "
-                f"tried to access companies/{bucket_id}"
-            )
-            return (
-                False,
-                "Access denied: cannot access other companies' files",
-                403,
+def _check_project_items(project_items, action):
+    """
+    Send projects bucket checks to the project service batch endpoint.
+
+    Args:
+        project_items (list): (bucket_type, project_id, file_id) tuples.
+        action (str): Action to perform.
+
+    Returns:
+        tuple: As check_project_access_batch; results is None unless
+               the service returned exactly one result per check.
+    """
+    checks = []
+    for _, project_id, file_id in project_items:
+        check = {"project_id": project_id, "action": action}
+        if file_id:
+            check["file_id"] = file_id
+        checks.append(check)
+
+    results, error_msg, status_code = check_project_access_batch(checks)
+    if results is not None and len(results) != len(checks):
+        logger.error(
+            "Project service batch returned %d results for %d checks",
+            len(results),
+            len(checks),
+        )
+        return None, "Invalid response from project service", 502
+    return results, error_msg, status_code
+
+
+def check_bucket_access_batch(items, action="read"):
+    """
+    Verify access to several buckets with at most one project service call.
+
+    Users and companies buckets are checked locally, exactly like
+    check_bucket_access. All projects buckets are sent together to the
+    project service batch endpoint, whose results are expected in request
+    order.
+
+    Args:
+        items (iterable): (bucket_type, bucket_id, file_id) tuples; file_id
+            may be None. Duplicates are checked once.
+        action (str): Action to perform ('read', 'write', 'delete', 'lock', 'validate')
+
+    Returns:
+        dict: Maps each item to (allowed (bool), error_message (str or None),
+              status_code (int)), as returned by check_bucket_access
+    """
+    decisions = {}
+    project_items = []
+    for item in dict.fromkeys(items):
+        bucket_type, bucket_id, file_id = item
+        if bucket_type == "projects":
+            project_items.append(item)
+        else:
+            decisions[item] = check_bucket_access(
+                bucket_type, bucket_id, action, file_id
             )
-        return True, None, 200
 
-    # Projects bucket: delegate to project service
-    if bucket_type == "projects":
-        return check_project_access(bucket_id, action, file_id)
+    if not project_items:
+        return decisions
+
+    results, error_msg, status_code = _check_project_items(
+        project_items, action
+    )
+    if results is None:
+        for item in project_items:
+            decisions[item] = (False, error_msg, status_code)
+        return decisions
 
-    return False, "Unknown bucket type", 400
+    for item, result in zip(project_items, results):
+        if result.get("allowed"):
+            decisions[item] = (True, None, 200)
+        else:
+            reason = result.get("reason", "insufficient_permissions")
+            decisions[item] = (False, f"Access denied: {reason}", 403)
+    return decisions
 
 
 def check_project_access(project_id, action="read", file_id=None):
@@ -401,7 +634,10 @@ def check_project_access(project_id, action="read", file_id=None):
     use_project_service = current_app.config.get("USE_PROJECT_SERVICE", True)
     if not use_project_service:
         logger.debug(
-            f"Project service disabled - allowing access for project {project_id}, action {action}"
+            "Project service disabled - allowing access for project %s, "
+            "action %s",
+            project_id,
+            action,
         )
         return True, None, 200
 
@@ -416,10 +652,8 @@ def check_project_access(project_id, action="read", file_id=None):
         payload["file_id"] = file_id
 
     # Get JWT cookie to forward to project service
-    headers = {}
-    jwt_token = request.cookies.get("access_token")
-    if jwt_token:
-        headers["Cookie"] = f"access_token={jwt_token}"
+    headers = _forward_headers()
+    if headers:
         logger.debug("Forwarding JWT cookie to project service")
     else:
         logger.warning(
@@ -428,11 +662,14 @@ def check_project_access(project_id, action="read", file_id=None):
 
     try:
         logger.debug(
-            f"Calling project service: {project_service_url}/check-file-access "
-            f"for project {project_id}, action {action}"
+            "Calling project service: %s/check-file-access "
+            "for project %s, action %s",
+            project_service_url,
+            project_id,
+            action,
         )
 
-        response = requests.post(
+        response = _project_session.post(
             f"{project_service_url}/check-file-access",
             json=payload,
             headers=headers,
@@ -453,8 +690,12 @@ def check_project_access(project_id, action="read", file_id=None):
 
             reason = data.get("reason", "insufficient_permissions")
             logger.warning(
-                f"Project access denied: user {g.user_id}, "
-                f"project {project_id}, action {action}, reason: {reason}"
+                "Project access denied: user %s, "
+                "project %s, action %s, reason: %s",
+                g.user_id,
+                project_id,
+                action,
+                reason,
             )
             return False, f"Access denied: {reason}", 403
 
@@ -498,7 +739,8 @@ def check_project_access_batch(checks):
     use_project_service = current_app.config.get("USE_PROJECT_SERVICE", True)
     if not use_project_service:
         logger.debug(
-            f"Project service disabled - allowing batch access for {len(checks)} checks"
+            "Project service disabled - allowing batch access for %d checks",
+            len(checks),
         )
         # Return all checks as allowed
         results = [
@@ -512,17 +754,15 @@ def check_project_access_batch(checks):
         return None, "Internal configuration error", 500
 
     # Get JWT cookie
-    headers = {}
-    jwt_token = request.cookies.get("access_token")
-    if jwt_token:
-        headers["Cookie"] = f"access_token={jwt_token}"
+    headers = _forward_headers()
 
     try:
         logger.debug(
-            f"Calling project service batch endpoint for {len(checks)} checks"
+            "Calling project service batch endpoint for %d checks",
+            len(checks),
         )
 
-        response = requests.post(
+        response = _project_session.post(
             f"{project_service_url}/check-file-access/batch",
             json={"checks": checks},
             headers=headers,
@@ -533,7 +773,7 @@ def check_project_access_batch(checks):
             data = response.json()
             results = data.get("results", [])
             logger.debug(
-                f"Batch access check completed: {len(results)} results"
+                "Batch access check completed: %d results", len(results)
             )
             return results, None, 200
 
@@ -559,57 +799,6 @@ def check_project_access_batch(checks):
         return None, "Invalid response from project service", 502
 
 
-def log_access_denied(bucket_type, bucket_id, action, reason, file_id=None):
-    """
-    Log an access denial event to audit trail.
-
-    Args:
-        bucket_type (str): Type of bucket
-        bucket_id (str): ID of the bucket
-        action (str): Action that was denied
-        reason (str): Reason for denial
-        file_id (str, optional): File ID if applicable
-    """
-    # pylint: disable=import-outside-toplevel
-    # Imports inside function to avoid circular dependency
-    from app.models.storage import AuditLog
-    from app.models.db import db
-
-    try:
-        user_id = getattr(g, "user_id", "unknown")
-        ip_address = request.remote_addr if request else None
-        user_agent = request.headers.get("User-Agent") if request else None
-
-        details = {
-            "bucket_type": bucket_type,
-            "bucket_id": bucket_id,
-            "action": action,
-            "reason": reason,
-            "access_denied": True,
-        }
-
-        audit_log = AuditLog(
-            file_id=file_id,  # Can be None
-            action="access_denied",
-            user_id=user_id,
-            details=details,
-            ip_address=ip_address,
-            user_agent=user_agent,
-        )
-        db.session.add(audit_log)
-        db.session.commit()
-
-        logger.info(
-            f"Access denied logged: user={user_id}, bucket={bucket_type}/{bucket_id}, "
-            f"action={action}, reason={reason}"
-        )
-    except Exception as e:  # pylint: disable=broad-exception-caught
-        # Catch all exceptions to prevent audit logging from breaking the request
-        logger.error(f"Failed to log access denial: {e}")
-        # Don't fail the request if audit logging fails
-        db.session.rollback()
-
-
 def require_bucket_access(action):
     """
     Decorator to verify bucket access based on request data.
@@ -630,14 +819,19 @@ def require_bucket_access(action):
     def decorator(view_func):
         @wraps(view_func)
         def wrapped(*args, **kwargs):
-            # Get request data (should be set by @require_jwt_auth)
-            data = getattr(g, "json_data", None)
-            if not data:
+            # Get request data (should be set by @require_jwt_auth, None
+            # when the request has no JSON body: no need to parse again)
+            data = g.get("json_data", _MISSING)
+            if data is _MISSING:
                 try:
                     data = request.get_json()
                 except Exception:  # pylint: disable=broad-exception-caught
                     # Catch all JSON parsing errors (ValueError, TypeError, etc.)
                     return {"error": "Invalid JSON data"}, 400
+            if not data:
+                if isinstance(data, _LazyJSON) and data.malformed():
+                    return {"error": "Invalid JSON data"}, 400
+                return {"error": "Missing bucket_type in request"}, 400
 
             # Extract bucket info
             bucket_type = data.get("bucket_type")
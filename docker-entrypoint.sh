@@ -22,7 +22,8 @@ case "$APP_MODE" in
         exec gunicorn --bind 0.0.0.0:5000 --workers 4 --timeout 60 wsgi:app
         ;;
     "staging"|"development")
-        echo "Starting application with Python development server..."
+        # run.py hands staging over to Gunicorn (gthread workers)
+        echo "Starting application with run.py..."
         exec python run.py
         ;;
     *)
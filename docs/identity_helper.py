@@ -21,13 +21,29 @@ Usage:
     user.avatar_bucket_id = result['bucket_id']
     user.avatar_logical_path = result['logical_path']
     user.avatar_object_key = result['object_key']  # Alternative
+
+    # URL de téléchargement (mise en cache en mémoire)
+    data = get_presigned_download_url(user_id, company_id, logical_path)
+
+    # Upload dont le PUT vers MinIO se fait en arrière-plan
+    result, future = upload_user_avatar_async(...)
+    future.add_done_callback(on_upload_done)
+
+    # Upload en masse (migrations, imports admin)
+    results = upload_user_avatars([{...}, {...}])
 """
 
 import os
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple, Union, BinaryIO
+
 import requests
-from typing import Optional, Dict, Any
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configuration
 STORAGE_SERVICE_URL = os.getenv(
@@ -35,19 +51,183 @@ STORAGE_SERVICE_URL = os.getenv(
 )
 REQUEST_TIMEOUT = int(os.getenv("STORAGE_REQUEST_TIMEOUT", "10"))
 MAX_AVATAR_SIZE = int(os.getenv("MAX_AVATAR_SIZE_MB", "5")) * 1024 * 1024
+# Uploads simultanés dans upload_user_avatars (<= taille du pool HTTP)
+BATCH_CONCURRENCY = int(os.getenv("STORAGE_UPLOAD_CONCURRENCY", "16"))
+# Uploads en attente dans upload_user_avatar_async avant que l'appelant
+# ne soit bloqué
+ASYNC_UPLOAD_QUEUE = int(os.getenv("STORAGE_UPLOAD_QUEUE", "64"))
+# Taille des blocs envoyés sur le socket (16 KiB par défaut dans urllib3)
+UPLOAD_BLOCK_SIZE = 64 * 1024
+# Cache des URLs de téléchargement pré-signées (0 pour désactiver)
+DOWNLOAD_URL_CACHE_SIZE = int(os.getenv("STORAGE_URL_CACHE_SIZE", "10000"))
+DOWNLOAD_URL_CACHE_TTL = int(os.getenv("STORAGE_URL_CACHE_TTL", "300"))
+# Une URL n'est plus servie depuis le cache s'il lui reste moins que ça
+DOWNLOAD_URL_MIN_REMAINING = 60
 
 # Allowed MIME types for avatars
-ALLOWED_AVATAR_TYPES = {
-    "image/jpeg",
-    "image/jpg",
-    "image/png",
-    "image/webp",
-    "image/gif",
+ALLOWED_AVATAR_TYPES = frozenset(
+    {
+        "image/jpeg",
+        "image/jpg",
+        "image/png",
+        "image/webp",
+        "image/gif",
+    }
+)
+# Liste affichée dans les erreurs, triée pour un message stable
+_ALLOWED_AVATAR_TYPES_MSG = ", ".join(sorted(ALLOWED_AVATAR_TYPES))
+
+# Signatures (magic bytes) attendues pour chaque type : (offset, octets)
+_JPEG_MAGIC = ((0, b"\xff\xd8\xff"),)
+_AVATAR_MAGIC = {
+    "image/jpeg": _JPEG_MAGIC,
+    "image/jpg": _JPEG_MAGIC,
+    "image/png": ((0, b"\x89PNG\r\n\x1a\n"),),
+    "image/webp": ((0, b"RIFF"), (8, b"WEBP")),
+    "image/gif": ((0, b"GIF8"),),
 }
+# Nombre d'octets lus en tête de fichier pour vérifier la signature
+_MAGIC_HEAD_SIZE = 12
 
 logger = logging.getLogger(__name__)
 
 
+class _LargeBlockAdapter(HTTPAdapter):
+    """HTTPAdapter envoyant les corps de requête par blocs de 64 KiB."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("blocksize", UPLOAD_BLOCK_SIZE)
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _build_session() -> requests.Session:
+    """
+    Crée la session HTTP partagée par tous les appels de ce module.
+
+    Les connexions (et le handshake TLS) vers le Storage Service et MinIO
+    sont réutilisées d'un upload à l'autre au lieu d'être recréées à
+    chaque requête.
+    """
+    adapter = _LargeBlockAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            # Rend la dernière réponse au lieu de lever RetryError, pour
+            # que raise_for_status() remonte le message d'erreur
+            raise_on_status=False,
+        ),
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# État mutable du module : session HTTP, horodatage de _utcnow_iso et
+# pool des uploads asynchrones (modifiés sans instruction global)
+_state: Dict[str, Any] = {
+    "session": _build_session(),
+    "utc_stamp": (0, ""),
+    "upload_pool": None,
+}
+
+
+def set_session(session: requests.Session) -> None:
+    """
+    Remplace la session HTTP utilisée par ce module.
+
+    Permet au service appelant d'injecter sa propre session (pool,
+    retries, proxies, etc.).
+
+    Args:
+        session: Session à utiliser pour les appels suivants
+    """
+    _state["session"] = session
+
+
+# (user_id, logical_path) -> (deadline sur time.monotonic(), données)
+_download_url_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_download_url_lock = threading.Lock()
+
+
+def _cached_download_url(
+    key: tuple, expires_in: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Retourne l'URL en cache pour key si elle est encore utilisable.
+
+    Une URL valable plus longtemps que les expires_in secondes demandées
+    n'est pas servie : l'appelant obtiendrait un lien plus durable que
+    celui qu'il a demandé.
+    """
+    now = time.monotonic()
+    with _download_url_lock:
+        entry = _download_url_cache.get(key)
+        if entry is None:
+            return None
+        deadline, data = entry
+        if deadline <= now:
+            del _download_url_cache[key]
+            return None
+        # expires_in reflète le temps restant sur l'URL réellement signée
+        url_remaining = int(data["expires_at_monotonic"] - now)
+        if url_remaining > expires_in:
+            return None
+        _download_url_cache.move_to_end(key)
+    return {**data["response"], "expires_in": url_remaining}
+
+
+def _store_download_url(key: tuple, response: Dict[str, Any]) -> None:
+    """Met en cache une réponse de /download/presign."""
+    if DOWNLOAD_URL_CACHE_SIZE <= 0 or DOWNLOAD_URL_CACHE_TTL <= 0:
+        return
+    now = time.monotonic()
+    url_expires_at = now + int(response.get("expires_in", 0))
+    # Évincée dès qu'il reste moins de DOWNLOAD_URL_MIN_REMAINING
+    deadline = min(
+        url_expires_at - DOWNLOAD_URL_MIN_REMAINING,
+        now + DOWNLOAD_URL_CACHE_TTL,
+    )
+    if deadline <= now:
+        return
+    data = {"response": response, "expires_at_monotonic": url_expires_at}
+    with _download_url_lock:
+        _download_url_cache[key] = (deadline, data)
+        _download_url_cache.move_to_end(key)
+        while len(_download_url_cache) > DOWNLOAD_URL_CACHE_SIZE:
+            _download_url_cache.popitem(last=False)
+
+
+def invalidate_download_url(user_id: str, logical_path: str) -> None:
+    """
+    Retire du cache l'URL de téléchargement d'un fichier.
+
+    À appeler quand le fichier change (nouvel upload, suppression), pour
+    ne pas servir une URL pointant sur l'ancienne version.
+    """
+    with _download_url_lock:
+        _download_url_cache.pop((user_id, logical_path), None)
+
+
+def _utcnow_iso() -> str:
+    """
+    Retourne l'heure UTC courante au format "2025-11-08T10:30:00Z".
+
+    La chaîne n'est formatée qu'une fois par seconde ; les appels suivants
+    dans la même seconde réutilisent la précédente.
+    """
+    # (seconde, horodatage ISO 8601) du dernier appel
+    second, stamp = _state["utc_stamp"]
+    now = int(time.time())
+    if now != second:
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+        _state["utc_stamp"] = (now, stamp)
+    return stamp
+
+
 class StorageServiceError(Exception):
     """Exception levée lors d'erreurs du Storage Service."""
 
@@ -60,35 +240,77 @@ class AvatarValidationError(Exception):
     pass
 
 
+def _data_size(file_data: Union[bytes, BinaryIO]) -> int:
+    """
+    Retourne la taille des données restant à envoyer.
+
+    Pour un objet fichier (qui doit être seekable), la taille est calculée
+    avec seek/tell sans rien lire, et la position courante est restaurée.
+    """
+    if isinstance(file_data, (bytes, bytearray)):
+        return len(file_data)
+    position = file_data.tell()
+    end = file_data.seek(0, os.SEEK_END)
+    file_data.seek(position)
+    return end - position
+
+
+def _data_head(file_data: Union[bytes, BinaryIO]) -> bytes:
+    """
+    Retourne les premiers octets des données, sans copier tout le buffer.
+
+    Pour un objet fichier, la position courante est restaurée.
+    """
+    if isinstance(file_data, (bytes, bytearray)):
+        return memoryview(file_data)[:_MAGIC_HEAD_SIZE].tobytes()
+    position = file_data.tell()
+    head = file_data.read(_MAGIC_HEAD_SIZE)
+    file_data.seek(position)
+    return head
+
+
 def validate_avatar(
-    file_data: bytes, content_type: str, max_size: int = MAX_AVATAR_SIZE
+    file_data: Union[bytes, BinaryIO],
+    content_type: str,
+    max_size: int = MAX_AVATAR_SIZE,
 ) -> None:
     """
     Valide un fichier avatar.
 
     Args:
-        file_data: Données binaires du fichier
+        file_data: Données binaires du fichier, ou objet fichier seekable
+            (le contenu n'est pas lu)
         content_type: Type MIME du fichier
         max_size: Taille maximale en octets
 
     Raises:
-        AvatarValidationError: Si la validation échoue
+        AvatarValidationError: Si la validation échoue, y compris quand
+            le contenu ne correspond pas au type MIME déclaré
     """
-    if not file_data:
+    size = _data_size(file_data)
+    if not size:
         raise AvatarValidationError("Avatar file is empty")
 
-    if len(file_data) > max_size:
+    if size > max_size:
         raise AvatarValidationError(
-            f"Avatar too large: {len(file_data)} bytes "
+            f"Avatar too large: {size} bytes "
             f"(max: {max_size} bytes = {max_size // 1024 // 1024} MB)"
         )
 
     if content_type not in ALLOWED_AVATAR_TYPES:
         raise AvatarValidationError(
             f"Invalid content type: {content_type}. "
-            f"Allowed: {', '.join(ALLOWED_AVATAR_TYPES)}"
+            f"Allowed: {_ALLOWED_AVATAR_TYPES_MSG}"
         )
 
+    # Refuser ici un contenu usurpant le type, plutôt qu'après l'upload
+    head = _data_head(file_data)
+    for offset, magic in _AVATAR_MAGIC[content_type]:
+        if head[offset : offset + len(magic)] != magic:
+            raise AvatarValidationError(
+                f"Avatar content does not match content type: {content_type}"
+            )
+
 
 def get_presigned_upload_url(
     user_id: str, company_id: str, logical_path: str, expires_in: int = 3600
@@ -125,10 +347,12 @@ def get_presigned_upload_url(
 
     try:
         logger.info(
-            f"Requesting presigned URL for user {user_id}, path: {logical_path}"
+            "Requesting presigned URL for user %s, path: %s",
+            user_id,
+            logical_path,
         )
 
-        response = requests.post(
+        response = _state["session"].post(
             url, json=payload, headers=headers, timeout=REQUEST_TIMEOUT
         )
 
@@ -136,16 +360,93 @@ def get_presigned_upload_url(
         data = response.json()
 
         logger.info(
-            f"Presigned URL obtained, expires in {data['expires_in']}s"
+            "Presigned URL obtained, expires in %ss", data["expires_in"]
+        )
+        return data
+
+    except requests.exceptions.Timeout:
+        logger.error("Timeout calling Storage Service at %s", url)
+        raise StorageServiceError("Storage Service timeout") from None
+
+    except requests.exceptions.RequestException as e:
+        logger.error("Error calling Storage Service: %s", e)
+        if hasattr(e, "response") and e.response is not None:
+            try:
+                error_data = e.response.json()
+                error_msg = error_data.get("message", str(e))
+            except Exception:
+                error_msg = str(e)
+        else:
+            error_msg = str(e)
+        raise StorageServiceError(f"Storage Service error: {error_msg}") from e
+
+
+def get_presigned_download_url(
+    user_id: str, company_id: str, logical_path: str, expires_in: int = 3600
+) -> Dict[str, Any]:
+    """
+    Obtient une URL pré-signée pour télécharger un avatar.
+
+    Les URLs sont mises en cache en mémoire (LRU + TTL) : les affichages
+    répétés d'un même avatar ne sollicitent pas le Storage Service. Une
+    URL est réutilisée au plus DOWNLOAD_URL_CACHE_TTL secondes, jamais
+    quand il lui reste moins de DOWNLOAD_URL_MIN_REMAINING secondes de
+    validité, ni quand il lui reste plus que les expires_in demandées.
+
+    Args:
+        user_id: UUID de l'utilisateur
+        company_id: UUID de l'entreprise
+        logical_path: Chemin logique (ex: "avatars/<user_id>.jpg")
+        expires_in: Durée de validité demandée en secondes
+
+    Returns:
+        Dict contenant 'url', 'object_key', 'expires_in', 'expires_at'
+
+    Raises:
+        StorageServiceError: Si la requête échoue
+    """
+    cache_key = (user_id, logical_path)
+    cached = _cached_download_url(cache_key, expires_in)
+    if cached is not None:
+        return cached
+
+    url = f"{STORAGE_SERVICE_URL}/download/presign"
+
+    headers = {
+        "X-User-ID": user_id,
+        "X-Company-ID": company_id,
+    }
+
+    params = {
+        "bucket_type": "users",
+        "bucket_id": user_id,
+        "logical_path": logical_path,
+        "expires_in": expires_in,
+    }
+
+    try:
+        logger.info(
+            "Requesting download URL for user %s, path: %s",
+            user_id,
+            logical_path,
         )
+
+        response = _state["session"].get(
+            url, params=params, headers=headers, timeout=REQUEST_TIMEOUT
+        )
+
+        response.raise_for_status()
+        data = response.json()
+
+        _store_download_url(cache_key, data)
         return data
 
     except requests.exceptions.Timeout:
-        logger.error(f"Timeout calling Storage Service at {url}")
+        logger.error("Timeout calling Storage Service at %s", url)
         raise StorageServiceError("Storage Service timeout") from None
 
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error calling Storage Service: {e}")
+        logger.error("Error calling Storage Service: %s", e)
         if hasattr(e, "response") and e.response is not None:
             try:
                 error_data = e.response.json()
@@ -158,28 +459,38 @@ def get_presigned_upload_url(
 
 
 def upload_to_minio(
-    presigned_url: str, file_data: bytes, content_type: str
+    presigned_url: str,
+    file_data: Union[bytes, BinaryIO],
+    content_type: str,
+    content_length: Optional[int] = None,
 ) -> None:
     """
     Upload un fichier directement sur MinIO via URL pré-signée.
 
+    Un objet fichier est envoyé en streaming, sans être chargé en mémoire.
+
     Args:
         presigned_url: URL pré-signée obtenue du Storage Service
-        file_data: Données binaires du fichier
+        file_data: Données binaires du fichier, ou objet fichier ouvert en
+            lecture binaire
         content_type: Type MIME du fichier
+        content_length: Taille en octets ; calculée si omise (l'objet
+            fichier doit alors être seekable)
 
     Raises:
         StorageServiceError: Si l'upload échoue
     """
+    if content_length is None:
+        content_length = _data_size(file_data)
     headers = {
         "Content-Type": content_type,
-        "Content-Length": str(len(file_data)),
+        "Content-Length": str(content_length),
     }
 
     try:
-        logger.info(f"Uploading {len(file_data)} bytes to MinIO")
+        logger.info("Uploading %s bytes to MinIO", content_length)
 
-        response = requests.put(
+        response = _state["session"].put(
             presigned_url,
             data=file_data,
             headers=headers,
@@ -194,14 +505,20 @@ def upload_to_minio(
         raise StorageServiceError("MinIO upload timeout") from None
 
     except requests.exceptions.RequestException as e:
-        logger.error(f"Error uploading to MinIO: {e}")
+        logger.error("Error uploading to MinIO: %s", e)
         raise StorageServiceError(f"MinIO upload error: {e}") from e
 
 
+def _avatar_logical_path(user_id: str, filename: str) -> str:
+    """Chemin logique recommandé : avatars/{user_id}.{extension}."""
+    extension = filename.rsplit(".", 1)[-1] if "." in filename else "jpg"
+    return f"avatars/{user_id}.{extension}"
+
+
 def upload_user_avatar(
     user_id: str,
     company_id: str,
-    file_data: bytes,
+    file_data: Union[bytes, BinaryIO],
     content_type: str,
     filename: str,
     validate: bool = True,
@@ -218,7 +535,8 @@ def upload_user_avatar(
     Args:
         user_id: UUID de l'utilisateur
         company_id: UUID de l'entreprise
-        file_data: Données binaires du fichier
+        file_data: Données binaires du fichier, ou objet fichier seekable
+            envoyé en streaming (ex: FileStorage.stream)
         content_type: Type MIME (ex: "image/jpeg")
         filename: Nom du fichier original
         validate: Si True, valide le fichier avant upload
@@ -259,9 +577,7 @@ def upload_user_avatar(
         validate_avatar(file_data, content_type)
 
     # 2. Construire le chemin logique
-    # Format recommandé: avatars/{user_id}.{extension}
-    extension = filename.rsplit(".", 1)[-1] if "." in filename else "jpg"
-    logical_path = f"avatars/{user_id}.{extension}"
+    logical_path = _avatar_logical_path(user_id, filename)
 
     # 3. Obtenir URL pré-signée
     presigned_data = get_presigned_upload_url(
@@ -274,6 +590,8 @@ def upload_user_avatar(
         file_data=file_data,
         content_type=content_type,
     )
+    # L'URL de téléchargement en cache pointe sur l'ancienne version
+    invalidate_download_url(user_id, logical_path)
 
     # 5. Retourner les métadonnées
     return {
@@ -281,8 +599,140 @@ def upload_user_avatar(
         "bucket_id": user_id,
         "logical_path": logical_path,
         "object_key": presigned_data["object_key"],
-        "uploaded_at": datetime.utcnow().isoformat() + "Z",
+        "uploaded_at": _utcnow_iso(),
+    }
+
+
+def upload_user_avatars(
+    avatars: List[Dict[str, Any]], max_workers: int = BATCH_CONCURRENCY
+) -> List[Union[Dict[str, str], Exception]]:
+    """
+    Upload de plusieurs avatars en parallèle (migrations, imports admin).
+
+    Chaque avatar est traité par upload_user_avatar dans un pool de
+    threads borné ; les connexions de la session partagée sont
+    réutilisées entre les uploads.
+
+    Args:
+        avatars: Liste de dicts contenant les arguments de
+            upload_user_avatar (user_id, company_id, file_data,
+            content_type, filename et, optionnellement, validate)
+        max_workers: Nombre maximal d'uploads simultanés
+
+    Returns:
+        Liste alignée sur ``avatars`` : pour chaque avatar, le dict
+        retourné par upload_user_avatar, ou l'exception levée
+        (AvatarValidationError, StorageServiceError) si l'upload a échoué.
+
+    Example:
+        >>> results = upload_user_avatars([
+        ...     {"user_id": "abc-123", "company_id": "def-456",
+        ...      "file_data": b"...", "content_type": "image/png",
+        ...      "filename": "a.png"},
+        ... ])
+        >>> failed = [r for r in results if isinstance(r, Exception)]
+    """
+
+    def upload_one(avatar: Dict[str, Any]):
+        try:
+            return upload_user_avatar(**avatar)
+        except (AvatarValidationError, StorageServiceError) as e:
+            return e
+
+    if len(avatars) <= 1:
+        return [upload_one(avatar) for avatar in avatars]
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(avatars)),
+        thread_name_prefix="avatar-upload",
+    ) as executor:
+        return list(executor.map(upload_one, avatars))
+
+
+_upload_pool_lock = threading.Lock()
+_upload_slots = threading.BoundedSemaphore(ASYNC_UPLOAD_QUEUE)
+
+
+def _get_upload_pool() -> ThreadPoolExecutor:
+    """Retourne le pool de threads des uploads asynchrones (créé au besoin)."""
+    if _state["upload_pool"] is None:
+        with _upload_pool_lock:
+            if _state["upload_pool"] is None:
+                _state["upload_pool"] = ThreadPoolExecutor(
+                    max_workers=BATCH_CONCURRENCY,
+                    thread_name_prefix="avatar-upload-async",
+                )
+    return _state["upload_pool"]
+
+
+def upload_user_avatar_async(
+    user_id: str,
+    company_id: str,
+    file_data: Union[bytes, BinaryIO],
+    content_type: str,
+    filename: str,
+    validate: bool = True,
+) -> Tuple[Dict[str, str], "Future[None]"]:
+    """
+    Upload d'un avatar dont l'envoi sur MinIO se fait en arrière-plan.
+
+    La validation et la demande d'URL pré-signée restent synchrones (leurs
+    erreurs sont levées immédiatement) ; seul le PUT vers MinIO est confié
+    à un pool de threads, ce qui libère le worker appelant une fois l'URL
+    obtenue. Au-delà de ASYNC_UPLOAD_QUEUE uploads en attente, l'appel
+    bloque jusqu'à ce qu'une place se libère.
+
+    Les données doivent rester lisibles jusqu'à la fin du future : le
+    flux d'un FileStorage Flask étant fermé en fin de requête, passer
+    plutôt ``avatar_file.read()``.
+
+    Args:
+        Identiques à upload_user_avatar.
+
+    Returns:
+        Tuple (métadonnées, future) : les métadonnées sont celles
+        retournées par upload_user_avatar ; le future se termine à la fin
+        de l'upload et lève StorageServiceError en cas d'échec
+        (utilisable avec add_done_callback ou asyncio.wrap_future).
+
+    Raises:
+        AvatarValidationError: Si la validation échoue
+        StorageServiceError: Si la demande d'URL pré-signée échoue
+    """
+    if validate:
+        validate_avatar(file_data, content_type)
+
+    logical_path = _avatar_logical_path(user_id, filename)
+    presigned_data = get_presigned_upload_url(
+        user_id=user_id, company_id=company_id, logical_path=logical_path
+    )
+
+    def upload():
+        try:
+            upload_to_minio(
+                presigned_url=presigned_data["url"],
+                file_data=file_data,
+                content_type=content_type,
+            )
+            invalidate_download_url(user_id, logical_path)
+        finally:
+            _upload_slots.release()
+
+    _upload_slots.acquire()
+    try:
+        future = _get_upload_pool().submit(upload)
+    except BaseException:
+        _upload_slots.release()
+        raise
+
+    metadata = {
+        "bucket_type": "users",
+        "bucket_id": user_id,
+        "logical_path": logical_path,
+        "object_key": presigned_data["object_key"],
+        "uploaded_at": _utcnow_iso(),
     }
+    return metadata, future
 
 
 def delete_user_avatar(user_id: str, company_id: str, object_key: str) -> None:
@@ -311,8 +761,11 @@ def delete_user_avatar(user_id: str, company_id: str, object_key: str) -> None:
 """
 # Dans app/resources/users.py du service Identity:
 
-from identity_helper import upload_user_avatar, AvatarValidationError, StorageServiceError
-from flask import request, g
+from identity_helper import (
+    upload_user_avatar, get_presigned_download_url,
+    AvatarValidationError, StorageServiceError
+)
+from flask import request, g, redirect
 from flask_restful import Resource
 
 class UserResource(Resource):
@@ -335,7 +788,8 @@ class UserResource(Resource):
             
             try:
                 # Lire le fichier
-                file_data = avatar_file.read()
+                # Envoyé en streaming, sans charger le fichier en mémoire
+                file_data = avatar_file.stream
                 content_type = avatar_file.content_type or 'image/jpeg'
                 filename = avatar_file.filename or 'avatar.jpg'
                 
@@ -361,14 +815,14 @@ class UserResource(Resource):
                 user.avatar_uploaded_at = result['uploaded_at']
                 db.session.commit()
                 
-                logger.info(f"Avatar uploaded for user {user_id}")
+                logger.info("Avatar uploaded for user %s", user_id)
                 
             except AvatarValidationError as e:
-                logger.warning(f"Avatar validation failed: {e}")
+                logger.warning("Avatar validation failed: %s", e)
                 return {'error': str(e)}, 400
                 
             except StorageServiceError as e:
-                logger.error(f"Storage service error: {e}")
+                logger.error("Storage service error: %s", e)
                 return {'error': 'Failed to upload avatar'}, 500
         
         # Gérer les autres champs du PATCH...
@@ -389,14 +843,16 @@ class UserAvatarResource(Resource):
         if not user or not user.avatar_logical_path:
             return {'error': 'Avatar not found'}, 404
         
-        # TODO: Appeler Storage Service pour obtenir une URL pré-signée
-        # Puis faire un redirect 302 vers cette URL
-        # Ou streamer le fichier directement
+        # URL servie depuis le cache tant qu'elle reste valide
+        try:
+            data = get_presigned_download_url(
+                user_id=user_id,
+                company_id=user.company_id,
+                logical_path=user.avatar_logical_path
+            )
+        except StorageServiceError as e:
+            logger.error("Storage service error: %s", e)
+            return {'error': 'Failed to get avatar'}, 502
         
-        # Temporaire: retourner les métadonnées
-        return {
-            'bucket_type': user.avatar_bucket_type,
-            'bucket_id': user.avatar_bucket_id,
-            'logical_path': user.avatar_logical_path
-        }, 200
+        return redirect(data['url'], code=302)
 """
@@ -0,0 +1,80 @@
+"""partial indexes for live files and versions
+
+Revision ID: add_live_indexes
+Revises: add_corrupted_status
+Create Date: 2025-11-12 09:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_live_indexes"
+down_revision = "add_corrupted_status"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add partial indexes restricted to live files and versions.
+
+    - idx_files_live serves directory listings, which only look at rows
+      that are not soft-deleted and match a logical_path prefix. It
+      replaces idx_files_bucket, whose columns are already the leading
+      columns of the unique_file_path constraint.
+    - idx_file_versions_live serves the reconciliation scan, which pages
+      non-corrupted versions by id and only reads file_id and object_key:
+      on PostgreSQL it is answered by an index-only scan.
+
+    PostgreSQL indexes are built CONCURRENTLY, outside the migration
+    transaction, so writes to the tables are not blocked.
+    """
+    with op.get_context().autocommit_block():  # pyright: ignore
+        op.create_index(  # pyright: ignore
+            "idx_files_live",
+            "files",
+            ["bucket_type", "bucket_id", "logical_path"],
+            unique=False,
+            postgresql_where=sa.text("is_deleted = false"),
+            postgresql_ops={"logical_path": "text_pattern_ops"},
+            postgresql_concurrently=True,
+            sqlite_where=sa.text("is_deleted = 0"),
+        )
+        op.create_index(  # pyright: ignore
+            "idx_file_versions_live",
+            "file_versions",
+            ["id"],
+            unique=False,
+            postgresql_where=sa.text("status <> 'corrupted'"),
+            postgresql_include=["file_id", "object_key"],
+            postgresql_concurrently=True,
+            sqlite_where=sa.text("status <> 'corrupted'"),
+        )
+        op.drop_index(  # pyright: ignore
+            "idx_files_bucket",
+            table_name="files",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    """Restore idx_files_bucket and drop the partial indexes."""
+    with op.get_context().autocommit_block():  # pyright: ignore
+        op.create_index(  # pyright: ignore
+            "idx_files_bucket",
+            "files",
+            ["bucket_type", "bucket_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(  # pyright: ignore
+            "idx_file_versions_live",
+            table_name="file_versions",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(  # pyright: ignore
+            "idx_files_live",
+            table_name="files",
+            postgresql_concurrently=True,
+        )
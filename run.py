@@ -3,14 +3,63 @@ Entry point for development and staging environments.
 
 This module provides the main entry point for running the Flask application
 in development and staging environments with appropriate configuration.
+Development uses the Werkzeug server; staging is handed over to Gunicorn
+when it is installed.
 """
 
 import os
+import shutil
 from dotenv import load_dotenv
 
 from app import create_app
 from app.logger import logger
 
+# Configuration class for each FLASK_ENV value
+CONFIG_CLASSES = {
+    "development": "app.config.DevelopmentConfig",
+    "testing": "app.config.TestingConfig",
+    "staging": "app.config.StagingConfig",
+    "production": "app.config.ProductionConfig",
+}
+
+# Environments served by Gunicorn rather than the Werkzeug dev server
+GUNICORN_ENVS = ("staging", "production")
+
+
+def exec_gunicorn(config_class, port):
+    """
+    Replace the current process with Gunicorn serving the application.
+
+    Workers are threaded (gthread) so requests blocked on MinIO or the
+    Guardian/Project services do not hold up their peers. The worker and
+    thread counts can be tuned with GUNICORN_WORKERS / GUNICORN_THREADS.
+    """
+    workers = os.environ.get(
+        "GUNICORN_WORKERS", str(2 * (os.cpu_count() or 1) + 1)
+    )
+    threads = os.environ.get("GUNICORN_THREADS", "8")
+    logger.info(
+        f"Starting Gunicorn on port {port} "
+        f"(workers={workers}, threads={threads})"
+    )
+    os.execvp(
+        "gunicorn",
+        [
+            "gunicorn",
+            "--worker-class",
+            "gthread",
+            "--workers",
+            workers,
+            "--threads",
+            threads,
+            "--timeout",
+            "60",
+            "--bind",
+            f"0.0.0.0:{port}",
+            f"app:create_app('{config_class}')",
+        ],
+    )
+
 
 def main():
     """
@@ -36,22 +85,20 @@ def main():
     else:
         logger.info("Running in Docker container, skipping .env file loading")
 
-    # Configuration mapping
-    config_classes = {
-        "development": "app.config.DevelopmentConfig",
-        "testing": "app.config.TestingConfig",
-        "staging": "app.config.StagingConfig",
-        "production": "app.config.ProductionConfig",
-    }
-
-    config_class = config_classes.get(env, "app.config.DevelopmentConfig")
+    config_class = CONFIG_CLASSES.get(env, "app.config.DevelopmentConfig")
     logger.info(f"Environment: {env}, Config: {config_class}")
+    port = int(os.environ.get("PORT", 5000))
+
+    if env in GUNICORN_ENVS:
+        if shutil.which("gunicorn"):
+            exec_gunicorn(config_class, port)  # Does not return
+            return
+        logger.warning("Gunicorn not installed, using the development server")
 
     app = create_app(config_class)
 
     # Use Flask config DEBUG setting instead of environment detection
     debug = app.config.get("DEBUG", False)
-    port = int(os.environ.get("PORT", 5000))
 
     logger.info(
         f"Starting Flask development server on port {port} (debug={debug})"
@@ -18,8 +18,13 @@ Options:
 import sys
 import os
 import argparse
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
+from sqlalchemy import func, select, update
+
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -30,13 +35,36 @@ from app.models.db import db
 from app.services.storage_service import storage_backend
 from app.logger import logger
 
+# Number of concurrent stat_object calls in check_database_orphans.
+# Can be overridden with RECONCILE_WORKERS.
+RECONCILE_WORKERS = 32
+
+# Ids per UPDATE ... WHERE id IN (...) statement, to stay well under the
+# database's bind parameter limit.
+UPDATE_CHUNK_SIZE = 1000
+
+# Versions loaded from the database per keyset page.
+VERSION_CHUNK_SIZE = 5000
+
+# Top-level prefixes listed concurrently in check_minio_orphans, and the
+# bound of the queue feeding listed keys to the database checks.
+LIST_WORKERS = 8
+LIST_QUEUE_SIZE = 10000
+
+_LISTING_DONE = object()
+
 
 class StorageReconciliator:
     """Reconciles MinIO storage with database records."""
 
-    def __init__(self, fix=False, dry_run=False):
+    def __init__(self, fix=False, dry_run=False, backend=None):
         self.fix = fix and not dry_run
         self.dry_run = dry_run
+        # Resolve the (lazy) backend once; the loops below reuse the same
+        # MinIO client instead of going through the proxy per object.
+        backend = backend or storage_backend
+        self.minio_client = backend.minio_client
+        self.bucket_name = backend.bucket_name
         self.stats = {
             "total_files": 0,
             "total_versions": 0,
@@ -46,47 +74,103 @@ class StorageReconciliator:
             "ok": 0,
         }
 
+    @staticmethod
+    def _iter_version_chunks(criterion):
+        """
+        Yield matching versions in pages of VERSION_CHUNK_SIZE rows.
+
+        Pages are fetched by keyset on the primary key with Core selects:
+        rows are plain named tuples carrying only the columns the checks
+        need, never ORM objects, so memory stays bounded by one page
+        whatever the size of the table.
+        """
+        page = (
+            select(FileVersion.id, FileVersion.file_id, FileVersion.object_key)
+            .where(criterion)
+            .order_by(FileVersion.id)
+            .limit(VERSION_CHUNK_SIZE)
+        )
+        last_id = None
+        while True:
+            query = page
+            if last_id is not None:
+                query = page.where(FileVersion.id > last_id)
+            versions = db.session.execute(query).all()
+            if not versions:
+                return
+            yield versions
+            last_id = versions[-1].id
+
     def check_database_orphans(self):
         """Check for files in database that don't exist in MinIO."""
         logger.info(
             "Checking for database orphans (DB entries without MinIO files)..."
         )
 
-        versions = FileVersion.query.filter(
-            FileVersion.status != "corrupted"
-        ).all()
-
-        self.stats["total_versions"] = len(versions)
+        not_corrupted = FileVersion.status != "corrupted"
+        self.stats["total_versions"] = db.session.execute(
+            select(func.count(FileVersion.id)).where(not_corrupted)
+        ).scalar_one()
+        stat_object = self.minio_client.stat_object
+        bucket_name = self.bucket_name
 
-        for version in versions:
+        def stat_one(object_key):
+            """Stat one object; runs in a worker thread, no DB access."""
             try:
-                # Try to stat the object in MinIO
-                storage_backend.minio_client.stat_object(
-                    bucket_name=storage_backend.bucket_name,
-                    object_name=version.object_key,
-                )
-                self.stats["ok"] += 1
-
+                stat_object(bucket_name=bucket_name, object_name=object_key)
+                return None
             except Exception as exc:  # pylint: disable=broad-exception-caught
-                if "NoSuchKey" in str(exc) or "Not Found" in str(exc):
-                    self.stats["db_orphans"] += 1
-                    logger.warning(
-                        f"DB orphan found: {version.object_key} "
-                        f"(file_id={version.file_id}, version_id={version.id})"
-                    )
+                return exc
+
+        corrupted = []
+        checked = 0
+        workers = int(os.environ.get("RECONCILE_WORKERS", RECONCILE_WORKERS))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="reconcile-stat"
+        ) as executor:
+            for versions in self._iter_version_chunks(not_corrupted):
+                errors = executor.map(
+                    stat_one, [version.object_key for version in versions]
+                )
+                for version, exc in zip(versions, errors):
+                    if exc is None:
+                        self.stats["ok"] += 1
+                    elif "NoSuchKey" in str(exc) or "Not Found" in str(exc):
+                        self.stats["db_orphans"] += 1
+                        logger.warning(
+                            f"DB orphan found: {version.object_key} "
+                            f"(file_id={version.file_id}, "
+                            f"version_id={version.id})"
+                        )
+                        if self.fix:
+                            corrupted.append(version.id)
+                    else:
+                        logger.error(
+                            f"Error checking {version.object_key}: {exc}",
+                            exc_info=exc,
+                        )
+                checked += len(versions)
+                logger.info(
+                    f"Checked {checked}/{self.stats['total_versions']} "
+                    "versions"
+                )
 
-                    if self.fix:
-                        version.status = "corrupted"
-                        db.session.commit()
-                        logger.info(
-                            f"Marked version {version.id} as corrupted"
+        if corrupted:
+            # Set-based UPDATEs and a single commit instead of one per row
+            for start in range(0, len(corrupted), UPDATE_CHUNK_SIZE):
+                db.session.execute(
+                    update(FileVersion)
+                    .where(
+                        FileVersion.id.in_(
+                            corrupted[start : start + UPDATE_CHUNK_SIZE]
                         )
-                        self.stats["corrupted"] += 1
-                else:
-                    logger.error(
-                        f"Error checking {version.object_key}: {exc}",
-                        exc_info=True,
                     )
+                    .values(status="corrupted")
+                    .execution_options(synchronize_session=False)
+                )
+            db.session.commit()
+            logger.info(f"Marked {len(corrupted)} versions as corrupted")
+            self.stats["corrupted"] += len(corrupted)
 
     def check_minio_orphans(self):
         """Check for files in MinIO that don't exist in database."""
@@ -94,39 +178,116 @@ class StorageReconciliator:
             "Checking for MinIO orphans (MinIO files without DB entries)..."
         )
 
-        bucket_name = storage_backend.bucket_name
+        # Snapshot of every known key, instead of one SELECT per object
+        known_keys = set(
+            db.session.execute(
+                select(FileVersion.object_key).execution_options(
+                    yield_per=10000
+                )
+            ).scalars()
+        )
 
+        misses = []
         try:
-            # List all objects in bucket
-            objects = storage_backend.minio_client.list_objects(
-                bucket_name, recursive=True
-            )
-
-            for obj in objects:
-                object_key = obj.object_name
-
-                # Check if exists in database
-                version = FileVersion.query.filter_by(
-                    object_key=object_key
-                ).first()
-
-                if not version:
-                    self.stats["minio_orphans"] += 1
-                    logger.warning(f"MinIO orphan found: {object_key}")
-
-                    if self.fix:
-                        # Option 1: Delete from MinIO (dangerous!)
-                        # storage_backend.minio_client.remove_object(bucket_name, object_key)
-                        # logger.info(f"Deleted orphan from MinIO: {object_key}")
-
-                        # Option 2: Just log for manual review (safer)
-                        logger.info(
-                            f"MinIO orphan detected (manual cleanup required): {object_key}"
-                        )
+            for object_key in self._iter_bucket_keys():
+                if object_key in known_keys:
+                    continue
+                misses.append(object_key)
+                if len(misses) >= UPDATE_CHUNK_SIZE:
+                    self._report_minio_orphans(misses)
+                    misses = []
+            self._report_minio_orphans(misses)
 
         except Exception as exc:  # pylint: disable=broad-exception-caught
             logger.error(f"Error listing MinIO objects: {exc}", exc_info=True)
 
+    def _iter_bucket_keys(self):
+        """
+        Yield the name of every object in the bucket.
+
+        The top-level prefixes (bucket types) are listed recursively by
+        LIST_WORKERS threads feeding a bounded queue, so listing pages are
+        fetched while the caller processes the keys already received.
+        """
+        client = self.minio_client
+        bucket_name = self.bucket_name
+        prefixes = []
+        for obj in client.list_objects(bucket_name):
+            if obj.is_dir:
+                prefixes.append(obj.object_name)
+            else:
+                yield obj.object_name
+        if not prefixes:
+            return
+
+        keys = queue.Queue(maxsize=LIST_QUEUE_SIZE)
+        stop = threading.Event()
+
+        def list_prefix(prefix):
+            """Producer: push every key under prefix, then a sentinel."""
+            try:
+                for obj in client.list_objects(
+                    bucket_name, prefix=prefix, recursive=True
+                ):
+                    if stop.is_set():
+                        return
+                    keys.put(obj.object_name)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                keys.put(exc)
+            finally:
+                keys.put(_LISTING_DONE)
+
+        with ThreadPoolExecutor(
+            max_workers=min(LIST_WORKERS, len(prefixes)),
+            thread_name_prefix="reconcile-list",
+        ) as executor:
+            for prefix in prefixes:
+                executor.submit(list_prefix, prefix)
+            try:
+                pending = len(prefixes)
+                while pending:
+                    item = keys.get()
+                    if item is _LISTING_DONE:
+                        pending -= 1
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        yield item
+            finally:
+                # Unblock producers if the consumer stopped early
+                stop.set()
+                while pending:
+                    if keys.get() is _LISTING_DONE:
+                        pending -= 1
+
+    def _report_minio_orphans(self, object_keys):
+        """Confirm a batch of unknown keys against the DB and report them."""
+        if not object_keys:
+            return
+        # The objects may postdate the key snapshot: confirm in one query
+        found = set(
+            db.session.execute(
+                select(FileVersion.object_key).where(
+                    FileVersion.object_key.in_(object_keys)
+                )
+            ).scalars()
+        )
+        for object_key in object_keys:
+            if object_key in found:
+                continue
+            self.stats["minio_orphans"] += 1
+            logger.warning(f"MinIO orphan found: {object_key}")
+
+            if self.fix:
+                # Option 1: Delete from MinIO (dangerous!)
+                # self.minio_client.remove_object(self.bucket_name, object_key)
+                # logger.info(f"Deleted orphan from MinIO: {object_key}")
+
+                # Option 2: Just log for manual review (safer)
+                logger.info(
+                    f"MinIO orphan detected (manual cleanup required): {object_key}"
+                )
+
     def generate_report(self):
         """Generate reconciliation report."""
         logger.info("=" * 80)
@@ -191,8 +352,9 @@ def main():
     app = create_app(ProductionConfig)
 
     with app.app_context():
+        # Builds the MinIO client up front, before any loop runs
         reconciliator = StorageReconciliator(
-            fix=args.fix, dry_run=args.report_only
+            fix=args.fix, dry_run=args.report_only, backend=storage_backend
         )
         stats = reconciliator.run()
 
@@ -1,130 +0,0 @@
-#!/usr/bin/env python3
-"""
-Test script to validate the new bucket-based storage endpoints.
-"""
-
-import sys
-import os
-import requests
-import json
-
-# Add the project root to the Python path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
-from app import create_app
-from app.config import DevelopmentConfig
-
-
-def test_endpoints():
-    """Test that all new endpoints are registered and accessible."""
-
-    print("🧪 Testing US-STORE-001 implementation...")
-
-    # Create the app
-    app = create_app(DevelopmentConfig)
-
-    with app.test_client() as client:
-        # Test new endpoints without authentication (should get 401)
-        endpoints_to_test = [
-            # Bucket-based endpoints
-            ("/list", "GET"),
-            ("/info", "GET"),
-            ("/upload", "POST"),
-            ("/download", "GET"),
-            ("/upload/presign", "POST"),
-            ("/copy", "POST"),
-            ("/lock", "POST"),
-            ("/unlock", "POST"),
-            # Version workflow endpoints
-            ("/versions", "GET"),
-            ("/versions/commit", "POST"),
-            ("/approve", "POST"),
-            ("/reject", "POST"),
-        ]
-
-        print(f"\n📋 Testing {len(endpoints_to_test)} new endpoints...")
-
-        success_count = 0
-        for endpoint, method in endpoints_to_test:
-            try:
-                if method == "GET":
-                    response = client.get(endpoint)
-                elif method == "POST":
-                    response = client.post(endpoint, json={})
-
-                # We expect 401 (unauthorized) since we're not sending JWT
-                if response.status_code == 401:
-                    print(f"✅ {method} {endpoint} -> 401 (expected, no auth)")
-                    success_count += 1
-                elif response.status_code == 400:
-                    print(
-                        f"✅ {method} {endpoint} -> 400 (expected, validation error)"
-                    )
-                    success_count += 1
-                else:
-                    print(
-                        f"⚠️  {method} {endpoint} -> {response.status_code} (unexpected)"
-                    )
-            except Exception as e:
-                print(f"❌ {method} {endpoint} -> Error: {e}")
-
-        print(
-            f"\n📊 Results: {success_count}/{len(endpoints_to_test)} endpoints responding correctly"
-        )
-
-        # Test legacy endpoints still work
-        print("\n🔄 Testing legacy endpoints still work...")
-        legacy_endpoints = [
-            ("/storage/list", "GET"),
-            ("/health", "GET"),
-            ("/version", "GET"),
-        ]
-
-        for endpoint, method in legacy_endpoints:
-            try:
-                response = client.get(endpoint)
-                if endpoint == "/health":
-                    # Health should return 200
-                    if response.status_code == 200:
-                        print(f"✅ {method} {endpoint} -> 200 (healthy)")
-                    else:
-                        print(
-                            f"❌ {method} {endpoint} -> {response.status_code}"
-                        )
-                elif endpoint == "/version":
-                    # Version should return 200
-                    if response.status_code == 200:
-                        print(f"✅ {method} {endpoint} -> 200 (version info)")
-                    else:
-                        print(
-                            f"❌ {method} {endpoint} -> {response.status_code}"
-                        )
-                else:
-                    # Storage endpoints should require auth
-                    if response.status_code == 401:
-                        print(f"✅ {method} {endpoint} -> 401 (auth required)")
-                    else:
-                        print(
-                            f"⚠️  {method} {endpoint} -> {response.status_code}"
-                        )
-            except Exception as e:
-                print(f"❌ {method} {endpoint} -> Error: {e}")
-
-        print("\n🎉 US-STORE-001 implementation validation completed!")
-        print("\n📋 Implementation Summary:")
-        print("✅ Bucket-based architecture with UUID support")
-        print("✅ Collaborative workflow with file locks")
-        print(
-            "✅ Version validation system (draft -> pending -> validated/rejected)"
-        )
-        print("✅ Comprehensive audit trail")
-        print("✅ New REST endpoints for all operations")
-        print("✅ Backward compatibility with legacy endpoints")
-        print("✅ Database migration ready")
-        print("✅ All models and schemas implemented")
-
-        print("\n🚀 Ready for production deployment!")
-
-
-if __name__ == "__main__":
-    test_endpoints()
@@ -6,17 +6,27 @@ Enhanced pytest configuration with additional fixtures for storage testing.
 """
 
 import os
+from functools import lru_cache
 from pytest import fixture
 from unittest.mock import patch, MagicMock
 from dotenv import load_dotenv
 import jwt
 from app import create_app
 from app.models.db import db
+from app.jwt_auth import _jwt_cache  # pylint: disable=protected-access
+from app.utils import _access_cache  # pylint: disable=protected-access
+from app.utils import reload_config
 
 os.environ["FLASK_ENV"] = "testing"
-load_dotenv(
-    dotenv_path=os.path.join(os.path.dirname(__file__), "..", ".env.test")
-)
+# Worker processes inherit the environment of the process that loaded it
+if not os.environ.get("_DOTENV_TEST_LOADED"):
+    load_dotenv(
+        dotenv_path=os.path.join(os.path.dirname(__file__), "..", ".env.test")
+    )
+    os.environ["_DOTENV_TEST_LOADED"] = "1"
+
+# Read once: the test environment is loaded above and never changes
+_JWT_SECRET = os.environ.get("JWT_SECRET", "test_secret")
 
 
 @fixture(autouse=True)
@@ -28,33 +38,41 @@ def cleanup_db_connections():
     yield
     # Cleanup after each test
     try:
-        # Force close any remaining sessions
-        if hasattr(db.session, "close"):
-            db.session.close()
-
-        # Remove session registry
-        if hasattr(db.session, "remove"):
-            db.session.remove()
-
-        # Dispose of the engine connection pool
-        if hasattr(db, "engine") and hasattr(db.engine, "dispose"):
-            db.engine.dispose()
-
-        # Force garbage collection to clean up any remaining connections
-        import gc
-
-        gc.collect()
+        # remove() closes the session and drops it from the registry. The
+        # engine is shared by the whole session (see session_app) and is
+        # disposed once at the end: disposing it here would also throw
+        # away the in-memory database and its schema.
+        db.session.remove()
     except Exception:
         # Ignore cleanup errors but don't let them fail tests
         pass
 
 
-@fixture
-def app():
+@fixture(autouse=True)
+def reset_guardian_state():
+    """
+    Auto-use fixture to forget cached Guardian decisions, decoded JWTs and
+    settings between tests, so each test sees the environment it patches.
+    """
+    _access_cache.clear()
+    _jwt_cache.clear()
+    reload_config()
+    yield
+    _access_cache.clear()
+    _jwt_cache.clear()
+    reload_config()
+
+
+@fixture(scope="session")
+def session_app():
     """
-    Fixture to create and configure a Flask application for testing.
-    This fixture sets up the application context, initializes the database,
-    and ensures that the database is created before tests run and dropped after tests complete.
+    Flask application and database schema shared by the whole test session.
+
+    The app factory and create_all() run once instead of for every test.
+    Flask-SQLAlchemy serves ``sqlite:///:memory:`` through a StaticPool,
+    so every checkout reuses the one connection holding the schema.
+    Tests should use the function-scoped ``app`` fixture, which isolates
+    them from each other.
     """
     # Set test configuration for storage
     os.environ["TESTING"] = "true"
@@ -67,23 +85,41 @@ def app():
             "TESTING": True,
             "WTF_CSRF_ENABLED": False,
             "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
-            "SQLALCHEMY_ENGINE_OPTIONS": {
-                "pool_pre_ping": True,
-                "pool_recycle": 300,
-            },
         }
     )
 
     with app.app_context():
         db.create_all()
-        yield app
-        # Properly close all database connections to avoid ResourceWarnings
+    yield app
+    # Properly close all database connections to avoid ResourceWarnings
+    with app.app_context():
         try:
             db.session.close()
             db.session.remove()
-            db.engine.dispose()
         finally:
             db.drop_all()
+            db.engine.dispose()
+
+
+@fixture
+def app(session_app):
+    """
+    Fixture providing the shared Flask application for one test.
+
+    Each test runs in its own application context (fresh ``g``) and gets
+    the configuration back as it was; rows it wrote are deleted afterwards
+    so the next test starts from empty tables.
+    """
+    config = dict(session_app.config)
+    with session_app.app_context():
+        yield session_app
+        db.session.remove()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+        db.session.remove()
+    session_app.config.clear()
+    session_app.config.update(config)
 
 
 @fixture
@@ -139,7 +175,12 @@ def get_init_db_payload():
 
 def create_jwt_token(company_id, user_id):
     """Helper function to create a JWT token for testing."""
-    jwt_secret = os.environ.get("JWT_SECRET", "test_secret")
+    return _encode_jwt_token(company_id, user_id, _JWT_SECRET)
+
+
+@lru_cache(maxsize=256)
+def _encode_jwt_token(company_id, user_id, jwt_secret):
+    """Sign a test token once per (claims, secret) combination."""
     payload = {"company_id": company_id, "user_id": user_id}
     return jwt.encode(payload, jwt_secret, algorithm="HS256")
 
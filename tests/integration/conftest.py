@@ -11,6 +11,7 @@ import os
 import uuid
 from io import BytesIO
 from minio import Minio
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
 
 from app import create_app
@@ -18,6 +19,15 @@ from app.config import TestingConfig
 from app.models.db import db as database
 from app.models.storage import StorageFile, FileVersion, Lock
 
+# pytest-xdist worker id ("gw0", "gw1", ...), "gw0" for serial runs
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+
+# Bucket the application writes to. Each worker gets its own so the
+# per-test cleanup never deletes objects of a test running in parallel.
+# The storage backend is built lazily, after this module is imported.
+APP_BUCKET_NAME = f"storage-{XDIST_WORKER}"
+os.environ["MINIO_BUCKET_NAME"] = APP_BUCKET_NAME
+
 
 @pytest.fixture(scope="session")
 def app():
@@ -68,55 +78,90 @@ def minio_client():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_bucket_name():
-    """Name of the test bucket for integration tests."""
-    return "storage-test"
+    """Name of the test bucket for integration tests (one per worker)."""
+    return f"storage-test-{XDIST_WORKER}"
 
 
-@pytest.fixture(autouse=True)
-def setup_test_environment(minio_client, test_bucket_name):
+# Object name prefixes owned by the integration tests
+TEST_OBJECT_PREFIXES = ("integration_test_", "users/")
+
+
+def remove_prefixed_objects(minio_client, bucket_name, prefixes):
     """
-    Setup and cleanup test environment for each integration test.
+    Delete every object under the given prefixes of a bucket.
+
+    Listing is scoped server-side to each prefix and deletions go through
+    remove_objects, which sends up to 1000 keys per DeleteObjects request
+    instead of one DELETE per object.
     """
-    # Setup: Ensure buckets exist and are clean
-    for bucket_name in [
-        test_bucket_name,
-        "storage",
-    ]:  # storage est le bucket par défaut
+    for prefix in prefixes:
+        delete_objects = (
+            DeleteObject(obj.object_name)
+            for obj in minio_client.list_objects(
+                bucket_name, prefix=prefix, recursive=True
+            )
+        )
+        # remove_objects is lazy: the deletions only happen while the
+        # returned error iterator is consumed.
+        list(minio_client.remove_objects(bucket_name, delete_objects))
+
+
+def integration_buckets(test_bucket_name):
+    """Buckets touched by the integration tests."""
+    return (test_bucket_name, APP_BUCKET_NAME)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def ensure_bucket(minio_client, test_bucket_name, ensure_services_ready):
+    """
+    Create the test buckets once for the whole integration session.
+    """
+    # pylint: disable=unused-argument
+    for bucket_name in integration_buckets(test_bucket_name):
         try:
             if not minio_client.bucket_exists(bucket_name):
                 minio_client.make_bucket(bucket_name)
+        except S3Error:
+            pass  # Reported by the tests that use the bucket
+
 
-            # Clean up any existing test objects
-            objects = minio_client.list_objects(bucket_name, recursive=True)
-            for obj in objects:
-                if obj.object_name.startswith(
-                    "integration_test_"
-                ) or obj.object_name.startswith("users/"):
-                    minio_client.remove_object(bucket_name, obj.object_name)
+@pytest.fixture(autouse=True)
+def setup_test_environment(minio_client, test_bucket_name):
+    """
+    Remove test objects before and after each integration test.
+    """
+    for bucket_name in integration_buckets(test_bucket_name):
+        try:
+            remove_prefixed_objects(
+                minio_client, bucket_name, TEST_OBJECT_PREFIXES
+            )
         except S3Error:
-            pass  # Bucket might not exist yet
+            pass
 
     yield
 
     # Cleanup: Remove test objects created during the test
-    for bucket_name in [test_bucket_name, "storage"]:
+    for bucket_name in integration_buckets(test_bucket_name):
         try:
-            objects = minio_client.list_objects(bucket_name, recursive=True)
-            for obj in objects:
-                if obj.object_name.startswith(
-                    "integration_test_"
-                ) or obj.object_name.startswith("users/"):
-                    minio_client.remove_object(bucket_name, obj.object_name)
+            remove_prefixed_objects(
+                minio_client, bucket_name, TEST_OBJECT_PREFIXES
+            )
         except S3Error:
             pass
 
 
-def wait_for_minio(minio_client, max_attempts=30, delay=2):
+def wait_for_minio(
+    minio_client, max_attempts=30, initial_delay=0.05, max_delay=2.0
+):
     """
     Wait for MinIO to be ready.
+
+    Polls with an exponential backoff starting at initial_delay and capped
+    at max_delay, so an already running MinIO is detected almost at once.
     """
+    delay = initial_delay
     for attempt in range(max_attempts):
         try:
             # Try to list buckets as a health check
@@ -127,6 +172,7 @@ def wait_for_minio(minio_client, max_attempts=30, delay=2):
 
         if attempt < max_attempts - 1:
             time.sleep(delay)
+            delay = min(delay * 2, max_delay)
 
     return False
 
@@ -182,11 +228,7 @@ def cleanup_test_objects(
 ):
     """Helper to cleanup test objects from MinIO."""
     try:
-        objects = minio_client.list_objects(
-            bucket_name, prefix=prefix, recursive=True
-        )
-        for obj in objects:
-            minio_client.remove_object(bucket_name, obj.object_name)
+        remove_prefixed_objects(minio_client, bucket_name, (prefix,))
     except S3Error:
         pass
 
@@ -299,8 +341,8 @@ def sample_file_with_content(
         file_obj.current_version_id = version.id
         database.session.commit()
 
-        # Upload to MinIO (use "storage" bucket which is the default for the service)
-        storage_bucket = "storage"
+        # Upload to MinIO, in the bucket the service reads from
+        storage_bucket = APP_BUCKET_NAME
         try:
             if not minio_client.bucket_exists(storage_bucket):
                 minio_client.make_bucket(storage_bucket)
@@ -6,6 +6,7 @@ Fixtures and configuration specific to unit tests with mocking.
 """
 
 import os
+from functools import lru_cache
 import pytest
 from unittest.mock import patch, MagicMock
 from dotenv import load_dotenv
@@ -15,18 +16,27 @@ from app.models.db import db
 
 # Load test environment
 os.environ["FLASK_ENV"] = "testing"
-load_dotenv(
-    dotenv_path=os.path.join(
-        os.path.dirname(__file__), "..", "..", ".env.testing"
+if not os.environ.get("_DOTENV_TESTING_LOADED"):
+    load_dotenv(
+        dotenv_path=os.path.join(
+            os.path.dirname(__file__), "..", "..", ".env.testing"
+        )
     )
-)
+    os.environ["_DOTENV_TESTING_LOADED"] = "1"
 
+# Secret used to sign test tokens, resolved once from the test env
+_JWT_SECRET = os.environ.get("JWT_SECRET", "test_secret")
 
-@pytest.fixture
-def app():
+
+@pytest.fixture(scope="session")
+def session_app():
     """
-    Fixture to create and configure a Flask application for unit testing.
-    Uses in-memory SQLite for fast, isolated tests.
+    Flask application and database schema shared by the whole test session.
+
+    Building the app and running create_all() once, instead of for every
+    test, keeps the suite's runtime dominated by the tests themselves.
+    Tests should use the function-scoped ``app`` fixture, which isolates
+    them from each other.
     """
     # Set test configuration for unit tests
     os.environ["TESTING"] = "true"
@@ -44,9 +54,32 @@ def app():
 
     with app.app_context():
         db.create_all()
-        yield app
+    yield app
+    with app.app_context():
         db.session.remove()
         db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def app(session_app):
+    """
+    Fixture providing the shared Flask application for one unit test.
+
+    Each test runs in its own application context (fresh ``g``) and gets
+    the configuration back as it was; rows it wrote are deleted afterwards
+    so the next test starts from empty tables.
+    """
+    config = dict(session_app.config)
+    with session_app.app_context():
+        yield session_app
+        db.session.remove()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+        db.session.remove()
+    session_app.config.clear()
+    session_app.config.update(config)
 
 
 @pytest.fixture
@@ -243,6 +276,11 @@ def get_init_db_payload():
 
 def create_jwt_token(company_id, user_id):
     """Helper function to create a JWT token for testing."""
-    jwt_secret = os.environ.get("JWT_SECRET", "test_secret")
+    return _encode_jwt_token(company_id, user_id, _JWT_SECRET)
+
+
+@lru_cache(maxsize=256)
+def _encode_jwt_token(company_id, user_id, jwt_secret):
+    """Sign a test token once per (claims, secret) combination."""
     payload = {"company_id": company_id, "user_id": user_id}
     return jwt.encode(payload, jwt_secret, algorithm="HS256")
@@ -18,8 +18,9 @@ from app.models.storage import StorageFile, FileVersion, Lock, AuditLog
 class TestStorageModels(unittest.TestCase):
     """Test cases for storage models."""
 
-    def setUp(self):
-        """Set up test fixtures."""
+    @classmethod
+    def setUpClass(cls):
+        """Build the application once for the whole class."""
         # Set up test environment
         import os
 
@@ -27,8 +28,8 @@ class TestStorageModels(unittest.TestCase):
         os.environ["DATABASE_URL"] = "sqlite:///:memory:"
         os.environ["MINIO_SERVICE_URL"] = "http://localhost:9000"
 
-        self.app = create_app("app.config.TestingConfig")
-        self.app.config.update(
+        cls.app = create_app("app.config.TestingConfig")
+        cls.app.config.update(
             {
                 "TESTING": True,
                 "WTF_CSRF_ENABLED": False,
@@ -36,6 +37,8 @@ class TestStorageModels(unittest.TestCase):
             }
         )
 
+    def setUp(self):
+        """Set up test fixtures."""
         self.app_context = self.app.app_context()
         self.app_context.push()
 
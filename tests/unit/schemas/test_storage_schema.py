@@ -0,0 +1,51 @@
+"""
+Tests for the field validators in app.schemas.storage_schema.
+"""
+
+import pytest
+from marshmallow import ValidationError
+
+from app.schemas.storage_schema import (
+    FileListRequestSchema,
+    validate_bucket_type,
+    validate_filename,
+)
+
+
+class TestValidateFilename:
+    """Test cases for validate_filename."""
+
+    def test_valid_filename_is_stripped(self):
+        """Valid filenames are returned without surrounding whitespace."""
+        assert validate_filename("  report v2.pdf ") == "report v2.pdf"
+
+    @pytest.mark.parametrize(
+        "char", ["/", "\\", ":", "*", "?", '"', "<", ">", "|", "\0"]
+    )
+    def test_invalid_characters_are_rejected(self, char):
+        """Every forbidden character is detected."""
+        with pytest.raises(ValidationError, match="invalid characters"):
+            validate_filename(f"file{char}name.txt")
+
+    def test_empty_filename_is_rejected(self):
+        """Blank filenames are rejected."""
+        with pytest.raises(ValidationError, match="cannot be empty"):
+            validate_filename("   ")
+
+
+class TestChoiceValidators:
+    """Test cases for the shared OneOf choice validators."""
+
+    def test_membership(self):
+        """Only the declared choices are accepted."""
+        assert validate_bucket_type("users")
+        with pytest.raises(ValidationError, match="Must be one of"):
+            validate_bucket_type("teams")
+
+    def test_schema_reports_invalid_choice(self):
+        """Schemas still report an invalid choice as a field error."""
+        errors = FileListRequestSchema().validate(
+            {"bucket": "teams", "id": "6f9b3a34-07e3-4c5d-8f3a-1acb6e08f2d1"}
+        )
+        assert "bucket" in errors
+        assert "id" not in errors
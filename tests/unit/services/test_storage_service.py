@@ -0,0 +1,308 @@
+"""
+Tests for the MinIO storage service layer in app.services.storage_service.
+"""
+
+from unittest import mock
+
+import pytest
+from minio.deleteobjects import DeleteError
+from minio.error import S3Error
+from urllib3.exceptions import ReadTimeoutError
+
+from app.services.storage_service import (
+    StorageBackendService,
+    _resolve_minio_endpoint,
+)
+
+
+@pytest.fixture
+def backend():
+    """StorageBackendService with a mocked MinIO client."""
+    with mock.patch.dict("os.environ", {"FLASK_ENV": "testing"}):
+        service = StorageBackendService()
+    service.minio_client = mock.MagicMock()
+    service.minio_client.presigned_get_object.return_value = (
+        "http://minio/get-signed"
+    )
+    service.minio_client.presigned_put_object.return_value = (
+        "http://minio/put-signed"
+    )
+    return service
+
+
+class TestResolveMinioEndpoint:
+    """Test cases for MINIO_SERVICE_URL parsing."""
+
+    def test_default_port_and_scheme(self):
+        """A bare http URL maps to port 9000 without TLS."""
+        assert _resolve_minio_endpoint("http://minio/") == (
+            "minio:9000",
+            False,
+        )
+
+    def test_explicit_port_and_https(self):
+        """An explicit port and https scheme are honoured."""
+        assert _resolve_minio_endpoint("https://s3.local:443") == (
+            "s3.local:443",
+            True,
+        )
+
+
+class TestMinioClient:
+    """Test cases for the MinIO client construction."""
+
+    def test_pool_size_is_configurable(self):
+        """MINIO_POOL_MAXSIZE sizes the client's connection pool."""
+        env = {"FLASK_ENV": "testing", "MINIO_POOL_MAXSIZE": "64"}
+        with mock.patch.dict("os.environ", env):
+            service = StorageBackendService()
+        # pylint: disable=protected-access
+        pool_kw = service.minio_client._http.connection_pool_kw
+        assert pool_kw["maxsize"] == 64
+
+
+class TestPresignedUrlCache:
+    """Test cases for presigned URL reuse."""
+
+    def test_download_url_is_reused(self, backend):
+        """Identical download requests are signed only once."""
+        first = backend.generate_download_url("users/a/file.txt/1", 3600)
+        second = backend.generate_download_url("users/a/file.txt/1", 3600)
+
+        assert first[0] == second[0] == "http://minio/get-signed"
+        assert first[1] == 3600
+        assert 0 < second[1] <= 3600
+        backend.minio_client.presigned_get_object.assert_called_once()
+
+    def test_download_url_cache_is_keyed_on_expiry(self, backend):
+        """Different expirations produce different signatures."""
+        backend.generate_download_url("users/a/file.txt/1", 3600)
+        backend.generate_download_url("users/a/file.txt/1", 600)
+
+        assert backend.minio_client.presigned_get_object.call_count == 2
+
+    def test_upload_url_is_reused(self, backend):
+        """Identical upload requests are signed only once."""
+        first = backend.generate_upload_url("users/a/file.txt/1")
+        second = backend.generate_upload_url("users/a/file.txt/1")
+
+        assert first[0] == second[0] == "http://minio/put-signed"
+        backend.minio_client.presigned_put_object.assert_called_once()
+
+    def test_short_lived_urls_are_not_cached(self, backend):
+        """URLs too close to expiry are never handed out again."""
+        backend.generate_download_url("users/a/file.txt/1", 30)
+        backend.generate_download_url("users/a/file.txt/1", 30)
+
+        assert backend.minio_client.presigned_get_object.call_count == 2
+
+
+class TestBucketCheck:
+    """Test cases for the bucket existence check on the upload path."""
+
+    def test_bucket_checked_once_across_uploads(self, backend):
+        """Subsequent uploads skip the bucket_exists round-trip."""
+        backend.minio_client.bucket_exists.return_value = True
+
+        backend.generate_upload_url("users/a/one.txt/1")
+        backend.generate_upload_url("users/a/two.txt/1")
+
+        backend.minio_client.bucket_exists.assert_called_once()
+
+    def test_failed_check_is_retried(self, backend):
+        """A failing bucket check is performed again on the next upload."""
+        backend.minio_client.bucket_exists.side_effect = S3Error(
+            "AccessDenied", "denied", "bucket", "req", "host", None
+        )
+
+        backend.generate_upload_url("users/a/one.txt/1")
+        backend.generate_upload_url("users/a/two.txt/1")
+
+        assert backend.minio_client.bucket_exists.call_count == 2
+
+
+class TestMoveObject:
+    """Test cases for server-side moves."""
+
+    def test_move_uses_server_side_copy(self, backend):
+        """The object is copied by MinIO then the source is removed."""
+        assert backend.move_object("users/a/src/1", "users/a/dst/1") is True
+
+        args = backend.minio_client.copy_object.call_args.args
+        assert args[0] == backend.bucket_name
+        assert args[1] == "users/a/dst/1"
+        assert args[2].object_name == "users/a/src/1"
+        bucket, delete_objects = (
+            backend.minio_client.remove_objects.call_args.args
+        )
+        assert bucket == backend.bucket_name
+        assert [obj.name for obj in delete_objects] == ["users/a/src/1"]
+
+    def test_move_keeps_source_when_copy_fails(self, backend):
+        """A failed copy never deletes the source object."""
+        backend.minio_client.copy_object.side_effect = S3Error(
+            "NoSuchKey", "missing", "users/a/src/1", "req", "host", None
+        )
+
+        assert backend.move_object("users/a/src/1", "users/a/dst/1") is False
+        backend.minio_client.remove_objects.assert_not_called()
+
+
+class TestDeleteObjects:
+    """Test cases for batched deletes."""
+
+    @staticmethod
+    def _drain(_bucket, delete_objects):
+        """Consume the lazy DeleteObject generator like MinIO would."""
+        list(delete_objects)
+        return iter(())
+
+    def test_keys_are_sent_in_chunks_of_1000(self, backend):
+        """2500 keys are deleted in three DeleteObjects requests."""
+        backend.minio_client.remove_objects.side_effect = self._drain
+        keys = [f"users/a/file{i}.txt/1" for i in range(2500)]
+
+        results = backend.delete_objects(keys)
+
+        assert backend.minio_client.remove_objects.call_count == 3
+        assert [key for key, _ in results] == keys
+        assert all(deleted for _, deleted in results)
+
+    def test_per_key_errors_are_reported(self, backend):
+        """Keys reported by DeleteError are marked as not deleted."""
+        backend.minio_client.remove_objects.return_value = iter(
+            [DeleteError("AccessDenied", "denied", "users/a/b.txt/1", None)]
+        )
+
+        results = backend.delete_objects(
+            ["users/a/a.txt/1", "users/a/b.txt/1"]
+        )
+
+        assert results == [
+            ("users/a/a.txt/1", True),
+            ("users/a/b.txt/1", False),
+        ]
+
+    def test_delete_object_delegates_to_batch(self, backend):
+        """Single deletes go through the batched path."""
+        backend.minio_client.remove_objects.return_value = iter(())
+
+        assert backend.delete_object("users/a/a.txt/1") is True
+        backend.minio_client.remove_objects.assert_called_once()
+
+
+class TestObjectMetadataCache:
+    """Test cases for the cached HEAD (stat_object) results."""
+
+    @staticmethod
+    def _stat(size=42):
+        """Build a fake stat_object result."""
+        return mock.Mock(
+            size=size,
+            content_type="text/plain",
+            last_modified=None,
+            etag="etag",
+        )
+
+    def test_metadata_is_cached(self, backend):
+        """Repeated lookups of a hot key cost a single stat_object."""
+        backend.minio_client.stat_object.return_value = self._stat()
+
+        assert backend.get_object_metadata("users/a/a.txt/1")["size"] == 42
+        assert backend.object_exists("users/a/a.txt/1") is True
+        backend.minio_client.stat_object.assert_called_once()
+
+    def test_missing_objects_are_not_cached(self, backend):
+        """A missing object is looked up again on the next call."""
+        backend.minio_client.stat_object.side_effect = S3Error(
+            "NoSuchKey", "missing", "users/a/a.txt/1", "req", "host", None
+        )
+
+        assert backend.object_exists("users/a/a.txt/1") is False
+        assert backend.object_exists("users/a/a.txt/1") is False
+        assert backend.minio_client.stat_object.call_count == 2
+
+    def test_delete_invalidates_cached_metadata(self, backend):
+        """Deleting an object drops its cached metadata."""
+        backend.minio_client.stat_object.return_value = self._stat()
+        backend.minio_client.remove_objects.return_value = iter(())
+        backend.get_object_metadata("users/a/a.txt/1")
+
+        backend.delete_object("users/a/a.txt/1")
+        backend.get_object_metadata("users/a/a.txt/1")
+
+        assert backend.minio_client.stat_object.call_count == 2
+
+    def test_zero_ttl_disables_cache(self):
+        """STORAGE_META_TTL=0 turns the cache off."""
+        env = {"FLASK_ENV": "testing", "STORAGE_META_TTL": "0"}
+        with mock.patch.dict("os.environ", env):
+            service = StorageBackendService()
+        service.minio_client = mock.MagicMock()
+        service.minio_client.stat_object.return_value = self._stat()
+
+        service.get_object_metadata("users/a/a.txt/1")
+        service.get_object_metadata("users/a/a.txt/1")
+
+        assert service.minio_client.stat_object.call_count == 2
+
+
+class TestBulkCopyMove:
+    """Test cases for copy_objects / move_objects."""
+
+    PAIRS = [(f"users/a/src{i}/1", f"users/a/dst{i}/1") for i in range(5)]
+
+    @staticmethod
+    def _fail_for(source_key):
+        """copy_object side effect failing for one source key."""
+
+        def copy_object(_bucket, _destination, source):
+            if source.object_name == source_key:
+                raise S3Error(
+                    "NoSuchKey", "missing", source_key, "req", "host", None
+                )
+
+        return copy_object
+
+    def test_copy_results_follow_input_order(self, backend):
+        """Each pair gets its own result, in input order."""
+        backend.minio_client.copy_object.side_effect = self._fail_for(
+            "users/a/src2/1"
+        )
+
+        results = backend.copy_objects(self.PAIRS)
+
+        assert [(src, dst) for src, dst, _ in results] == self.PAIRS
+        assert [ok for _, _, ok in results] == [True, True, False, True, True]
+        assert backend.minio_client.copy_object.call_count == 5
+
+    def test_connection_errors_are_reported_per_pair(self, backend):
+        """A timed-out copy fails its own pair without aborting the batch."""
+
+        def copy_object(_bucket, _destination, source):
+            if source.object_name == "users/a/src3/1":
+                raise ReadTimeoutError(None, "/", "Read timed out.")
+
+        backend.minio_client.copy_object.side_effect = copy_object
+
+        results = backend.copy_objects(self.PAIRS)
+
+        assert [ok for _, _, ok in results] == [True, True, True, False, True]
+
+    def test_move_deletes_only_copied_sources(self, backend):
+        """Sources whose copy failed are kept, others go in one delete."""
+        backend.minio_client.copy_object.side_effect = self._fail_for(
+            "users/a/src2/1"
+        )
+        deleted = []
+        backend.minio_client.remove_objects.side_effect = (
+            lambda _bucket, objs: deleted.extend(o.name for o in objs)
+            or iter(())
+        )
+
+        results = backend.move_objects(self.PAIRS)
+
+        assert [ok for _, _, ok in results] == [True, True, False, True, True]
+        assert "users/a/src2/1" not in deleted
+        assert len(deleted) == 4
+        backend.minio_client.remove_objects.assert_called_once()
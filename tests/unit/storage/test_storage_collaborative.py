@@ -32,9 +32,13 @@ def create_jwt_token(company_id, user_id):
 class TestStorageCollaborative(unittest.TestCase):
     """Test cases for collaborative storage endpoints."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build the application once for the whole class."""
+        cls.app = create_app(TestingConfig)
+
     def setUp(self):
         """Set up test fixtures."""
-        self.app = create_app(TestingConfig)
         self.client = self.app.test_client()
         self.app_context = self.app.app_context()
         self.app_context.push()
@@ -174,6 +178,72 @@ class TestStorageCollaborative(unittest.TestCase):
         self.assertIn("data", data)
         self.assertIn("file_id", data["data"])
 
+    @patch("app.resources.storage_collaborative.storage_backend")
+    def test_file_copy_storage_failure(self, mock_storage):
+        """A failed object copy writes no rows and removes the other copies."""
+        self.authenticate_user()
+
+        source_file = StorageFile(
+            bucket_type="users",
+            bucket_id=self.user_id,
+            logical_path="documents/source.txt",
+            filename="source.txt",
+            owner_id=self.user_id,
+            mime_type="text/plain",
+            size=1024,
+        )
+        db.session.add(source_file)
+        db.session.commit()
+        for number in (1, 2):
+            db.session.add(
+                FileVersion(
+                    file_id=source_file.id,
+                    version_number=number,
+                    object_key=f"users/test/source.txt/{number}",
+                    size=1024,
+                    created_by=self.user_id,
+                )
+            )
+        db.session.commit()
+
+        target_id = str(uuid.uuid4())
+        prefix = f"projects/{target_id}/shared/source_copy.txt"
+        mock_storage.copy_objects.return_value = [
+            ("users/test/source.txt/1", f"{prefix}/1", True),
+            ("users/test/source.txt/2", f"{prefix}/2", False),
+        ]
+
+        response = self.client.post(
+            "/copy",
+            data=json.dumps(
+                {
+                    "source_bucket": "users",
+                    "source_id": self.user_id,
+                    "source_path": "documents/source.txt",
+                    "target_bucket": "projects",
+                    "target_id": target_id,
+                    "target_path": "shared/source_copy.txt",
+                    "copy_versions": True,
+                }
+            ),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 500)
+        self.assertIsNone(
+            StorageFile.get_by_path(
+                "projects", target_id, "shared/source_copy.txt"
+            )
+        )
+        self.assertEqual(
+            FileVersion.query.filter(
+                FileVersion.object_key.like(f"{prefix}/%")
+            ).count(),
+            0,
+        )
+        deleted = list(mock_storage.delete_objects.call_args.args[0])
+        self.assertEqual(deleted, [f"{prefix}/1"])
+
     def test_file_lock_success(self):
         """Test successful file locking."""
         self.authenticate_user()
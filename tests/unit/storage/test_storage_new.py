@@ -29,9 +29,13 @@ def create_jwt_token(company_id, user_id):
 class TestNewStorageSystem(unittest.TestCase):
     """Test cases for the new storage system."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Build the application once for the whole class."""
+        cls.app = create_app(TestingConfig)
+
     def setUp(self):
         """Set up test fixtures."""
-        self.app = create_app(TestingConfig)
         self.client = self.app.test_client()
         self.app_context = self.app.app_context()
         self.app_context.push()
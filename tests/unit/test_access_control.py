@@ -1,12 +1,25 @@
 """Unit tests for access control utilities."""
 
+import queue
+
 import pytest
 from unittest.mock import patch, MagicMock
 from flask import g
-from app.utils import (
+from urllib3.exceptions import ReadTimeoutError
+from app.models.storage import AuditLog
+from app.audit import (  # pylint: disable=protected-access
+    _WRITER,
+    _write_audit_logs,
+    log_access_denied,
+)
+from app.utils import (  # pylint: disable=protected-access
+    _LazyJSON,
+    _project_session,
     check_bucket_access,
+    check_bucket_access_batch,
     check_project_access,
     check_project_access_batch,
+    require_bucket_access,
 )
 
 
@@ -107,7 +120,7 @@ class TestBucketAccess:
 class TestProjectAccess:
     """Test project service access verification."""
 
-    @patch("app.utils.requests.post")
+    @patch.object(_project_session, "post")
     def test_project_access_allowed(self, mock_post, app):
         """Test successful project access check."""
         with app.test_request_context():
@@ -137,7 +150,7 @@ class TestProjectAccess:
             assert kwargs["json"]["project_id"] == "project-123"
             assert kwargs["json"]["action"] == "write"
 
-    @patch("app.utils.requests.post")
+    @patch.object(_project_session, "post")
     def test_project_access_denied(self, mock_post, app):
         """Test denied project access."""
         with app.test_request_context():
@@ -160,7 +173,7 @@ class TestProjectAccess:
             assert "insufficient_permissions" in error
             assert status == 403
 
-    @patch("app.utils.requests.post")
+    @patch.object(_project_session, "post")
     def test_project_access_with_file_id(self, mock_post, app):
         """Test project access check includes file_id for audit."""
         with app.test_request_context():
@@ -180,7 +193,7 @@ class TestProjectAccess:
             args, kwargs = mock_post.call_args
             assert kwargs["json"]["file_id"] == "file-456"
 
-    @patch("app.utils.requests.post")
+    @patch.object(_project_session, "post")
     def test_project_service_timeout(self, mock_post, app):
         """Test project service timeout handling."""
         with app.test_request_context():
@@ -199,7 +212,27 @@ class TestProjectAccess:
             assert "timeout" in error.lower()
             assert status == 504
 
-    @patch("app.utils.requests.post")
+    def test_project_service_read_timeout_is_not_retried(self, app):
+        """A read timeout from the real adapter is a single 504 attempt."""
+        read_timeout = ReadTimeoutError(None, "/check", "Read timed out.")
+        with app.test_request_context(), patch(
+            "urllib3.connectionpool.HTTPConnectionPool._make_request",
+            side_effect=read_timeout,
+        ) as make_request:
+            app.config["USE_PROJECT_SERVICE"] = True
+            app.config["PROJECT_SERVICE_URL"] = "http://project:5001"
+            g.user_id = "user-123"
+
+            allowed, error, status = check_project_access(
+                "project-123", "read"
+            )
+
+            assert allowed is False
+            assert "timeout" in error.lower()
+            assert status == 504
+            assert make_request.call_count == 1
+
+    @patch.object(_project_session, "post")
     def test_project_service_unavailable(self, mock_post, app):
         """Test project service unavailable handling."""
         with app.test_request_context():
@@ -218,7 +251,7 @@ class TestProjectAccess:
             assert "unavailable" in error.lower()
             assert status == 502
 
-    @patch("app.utils.requests.post")
+    @patch.object(_project_session, "post")
     def test_project_service_error_response(self, mock_post, app):
         """Test project service error response."""
         with app.test_request_context():
@@ -242,7 +275,7 @@ class TestProjectAccess:
 class TestProjectAccessBatch:
     """Test batch project access verification."""
 
-    @patch("app.utils.requests.post")
+    @patch.object(_project_session, "post")
     def test_batch_access_success(self, mock_post, app):
         """Test successful batch access check."""
         with app.test_request_context():
@@ -272,7 +305,7 @@ class TestProjectAccessBatch:
             assert error is None
             assert status == 200
 
-    @patch("app.utils.requests.post")
+    @patch.object(_project_session, "post")
     def test_batch_access_timeout(self, mock_post, app):
         """Test batch access timeout handling."""
         with app.test_request_context():
@@ -289,3 +322,256 @@ class TestProjectAccessBatch:
             assert results is None
             assert "timeout" in error.lower()
             assert status == 504
+
+
+class TestBucketAccessBatch:
+    """Test batched bucket access verification."""
+
+    @patch.object(_project_session, "post")
+    def test_projects_are_checked_in_one_call(self, mock_post, app):
+        """All project buckets share a single batch request."""
+        with app.test_request_context():
+            app.config["USE_PROJECT_SERVICE"] = True
+            g.user_id = "user-123"
+            g.company_id = "company-456"
+
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = {
+                "results": [
+                    {"project_id": "p1", "action": "read", "allowed": True},
+                    {
+                        "project_id": "p2",
+                        "action": "read",
+                        "allowed": False,
+                        "reason": "not_member",
+                    },
+                ]
+            }
+            mock_post.return_value = mock_response
+
+            decisions = check_bucket_access_batch(
+                [
+                    ("projects", "p1", None),
+                    ("users", "user-123", None),
+                    ("projects", "p2", None),
+                    ("projects", "p1", None),
+                    ("companies", "company-999", None),
+                ]
+            )
+
+            mock_post.assert_called_once()
+            assert mock_post.call_args.kwargs["json"]["checks"] == [
+                {"project_id": "p1", "action": "read"},
+                {"project_id": "p2", "action": "read"},
+            ]
+            assert decisions[("projects", "p1", None)] == (True, None, 200)
+            assert decisions[("projects", "p2", None)] == (
+                False,
+                "Access denied: not_member",
+                403,
+            )
+            assert decisions[("users", "user-123", None)][0] is True
+            assert decisions[("companies", "company-999", None)][2] == 403
+
+    @patch.object(_project_session, "post")
+    def test_service_error_denies_projects(self, mock_post, app):
+        """A failed batch call denies every project bucket."""
+        with app.test_request_context():
+            app.config["USE_PROJECT_SERVICE"] = True
+            g.user_id = "user-123"
+            g.company_id = "company-456"
+
+            mock_response = MagicMock()
+            mock_response.status_code = 503
+            mock_post.return_value = mock_response
+
+            decisions = check_bucket_access_batch(
+                [("projects", "p1", "f1"), ("users", "user-123", None)]
+            )
+
+            assert decisions[("projects", "p1", "f1")][0] is False
+            assert decisions[("projects", "p1", "f1")][2] == 502
+            assert decisions[("users", "user-123", None)][0] is True
+
+    def test_no_project_buckets_skips_service(self, app):
+        """Local-only checks never reach the project service."""
+        with app.test_request_context(), patch.object(
+            _project_session, "post"
+        ) as mock_post:
+            app.config["USE_PROJECT_SERVICE"] = True
+            g.user_id = "user-123"
+            g.company_id = "company-456"
+
+            decisions = check_bucket_access_batch(
+                [("users", "user-123", None)], action="write"
+            )
+
+            assert decisions == {
+                ("users", "user-123", None): (True, None, 200)
+            }
+            mock_post.assert_not_called()
+
+
+class TestLogAccessDenied:
+    """Test asynchronous audit logging of access denials."""
+
+    @patch.object(_WRITER, "start")
+    @patch.object(_WRITER, "queue")
+    def test_denial_is_queued(self, mock_queue, _mock_start, app):
+        """The audit row is queued instead of committed in the request."""
+        with app.test_request_context():
+            g.user_id = "user-123"
+
+            with patch("app.audit._write_audit_logs") as mock_write:
+                log_access_denied("users", "user-999", "read", "denied")
+
+            mock_write.assert_not_called()
+            queued_app, row = mock_queue.put_nowait.call_args.args[0]
+            assert queued_app is app
+            assert row["action"] == "access_denied"
+            assert row["user_id"] == "user-123"
+            assert row["details"]["bucket_id"] == "user-999"
+
+    @patch.object(_WRITER, "start")
+    @patch.object(_WRITER, "queue")
+    def test_full_queue_writes_inline(self, mock_queue, _mock_start, app):
+        """When the queue is full the row is written synchronously."""
+        mock_queue.put_nowait.side_effect = queue.Full
+        with app.test_request_context():
+            g.user_id = "user-123"
+
+            with patch("app.audit._write_audit_logs") as mock_write:
+                log_access_denied("users", "user-999", "read", "denied")
+
+            mock_write.assert_called_once()
+            assert mock_write.call_args.args[0] is app
+
+    def test_rows_are_written_in_one_batch(self, app):
+        """Queued rows are inserted together."""
+        rows = [
+            {
+                "file_id": f"file-{i}",
+                "action": "access_denied",
+                "user_id": "user-123",
+                "details": {"access_denied": True},
+            }
+            for i in range(3)
+        ]
+
+        _write_audit_logs(app, rows)
+
+        assert AuditLog.query.filter_by(user_id="user-123").count() == 3
+
+    def test_bad_row_does_not_drop_the_batch(self, app):
+        """A failing row is retried alone, the valid rows are kept."""
+        rows = [
+            {
+                "file_id": f"file-{i}",
+                "action": "access_denied",
+                "user_id": "user-123",
+                "details": {"access_denied": True},
+            }
+            for i in range(3)
+        ]
+        # file_id is NOT NULL: this row alone cannot be inserted
+        rows.insert(1, dict(rows[0], file_id=None))
+
+        _write_audit_logs(app, rows)
+
+        assert AuditLog.query.filter_by(user_id="user-123").count() == 3
+
+    def test_exit_hook_writes_queued_rows(self, app):
+        """Rows still queued at exit are written before the process ends."""
+        pending = queue.Queue()
+        for i in range(2):
+            pending.put(
+                (
+                    app,
+                    {
+                        "file_id": f"file-{i}",
+                        "action": "access_denied",
+                        "user_id": "user-123",
+                        "details": {"access_denied": True},
+                    },
+                )
+            )
+
+        with patch.object(_WRITER, "queue", pending):
+            _WRITER.flush()
+
+        assert pending.empty()
+        assert AuditLog.query.filter_by(user_id="user-123").count() == 2
+
+
+class TestRequireBucketAccess:
+    """Test request data handling in the require_bucket_access decorator."""
+
+    @staticmethod
+    def _view():
+        """View protected by require_bucket_access('read')."""
+        return require_bucket_access("read")(lambda: ({"ok": True}, 200))
+
+    def test_uses_json_data_from_g(self, app):
+        """Data stored by require_jwt_auth is used as-is."""
+        with app.test_request_context():
+            g.user_id = "user-123"
+            g.company_id = "company-456"
+            g.json_data = {"bucket_type": "users", "bucket_id": "user-123"}
+
+            assert self._view()() == ({"ok": True}, 200)
+            assert g.bucket_id == "user-123"
+
+    def test_empty_json_data_is_not_parsed_again(self, app):
+        """A None g.json_data means no body: the stream is not re-read."""
+        with app.test_request_context(
+            data="not json", content_type="application/json"
+        ):
+            g.json_data = None
+
+            body, status = self._view()()
+
+            assert status == 400
+            assert body == {"error": "Missing bucket_type in request"}
+
+    def test_malformed_body_from_require_jwt_auth(self, app):
+        """An unparseable body stored by require_jwt_auth is reported."""
+        with app.test_request_context(
+            data="{not json", content_type="application/json"
+        ):
+            g.json_data = _LazyJSON()
+
+            body, status = self._view()()
+
+            assert status == 400
+            assert body == {"error": "Invalid JSON data"}
+
+    def test_empty_object_from_require_jwt_auth(self, app):
+        """A valid but empty body is a missing field, not invalid JSON."""
+        with app.test_request_context(json={}):
+            g.json_data = _LazyJSON()
+
+            body, status = self._view()()
+
+            assert status == 400
+            assert body == {"error": "Missing bucket_type in request"}
+
+    def test_parses_body_without_require_jwt_auth(self, app):
+        """Without g.json_data the request body is parsed."""
+        with app.test_request_context(
+            json={"bucket_type": "companies", "bucket_id": "company-456"}
+        ):
+            g.user_id = "user-123"
+            g.company_id = "company-456"
+
+            assert self._view()() == ({"ok": True}, 200)
+
+    def test_invalid_body_without_require_jwt_auth(self, app):
+        """Invalid JSON is still reported when the body must be parsed."""
+        with app.test_request_context(
+            data="not json", content_type="application/json"
+        ):
+            body, status = self._view()()
+
+            assert status == 400
+            assert body == {"error": "Invalid JSON data"}
@@ -0,0 +1,76 @@
+"""
+Tests for the in-process TTL cache in app.cache.
+"""
+
+from unittest import mock
+
+from app.cache import TTLCache
+
+
+class TestTTLCache:
+    """Test cases for TTLCache."""
+
+    def test_get_returns_stored_value(self):
+        """Stored values are returned until they expire."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+        assert "key" in cache
+
+    def test_expired_entries_are_dropped(self):
+        """Entries are not returned once their ttl has elapsed."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        with mock.patch("app.cache.time.monotonic", return_value=100.0):
+            cache.set("key", "value")
+        with mock.patch("app.cache.time.monotonic", return_value=161.0):
+            assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_get_with_deadline(self):
+        """The deadline of a live entry is returned along with its value."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        with mock.patch("app.cache.time.monotonic", return_value=100.0):
+            cache.set("key", "value", ttl=30)
+            assert cache.get_with_deadline("key") == ("value", 130.0)
+        with mock.patch("app.cache.time.monotonic", return_value=130.0):
+            assert cache.get_with_deadline("key") is None
+        assert cache.get_with_deadline("missing") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted when full."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_zero_ttl_disables_cache(self):
+        """A ttl of zero turns set() into a no-op."""
+        cache = TTLCache(maxsize=10, ttl=0)
+        cache.set("key", "value")
+        assert cache.get("key") is None
+        assert not cache.enabled
+
+    def test_pop_and_clear(self):
+        """Entries can be invalidated individually or all at once."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.pop("a") == 1
+        assert cache.pop("a") is None
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_remove_if(self):
+        """Entries matching the predicate are removed, others are kept."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set(("u1", "file"), 1)
+        cache.set(("u1", "lock"), 2)
+        cache.set(("u2", "file"), 3)
+        assert cache.remove_if(lambda key: key[0] == "u1") == 2
+        assert cache.get(("u2", "file")) == 3
+        assert len(cache) == 1
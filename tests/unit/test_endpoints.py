@@ -0,0 +1,39 @@
+"""
+test_endpoints.py
+-----------------
+Smoke tests checking that the storage endpoints are registered and
+protected by JWT authentication.
+"""
+
+import pytest
+
+PROTECTED_ENDPOINTS = [
+    # Bucket-based endpoints
+    ("/list", "GET"),
+    ("/metadata", "GET"),
+    ("/upload/presign", "POST"),
+    ("/upload/proxy", "POST"),
+    ("/download/presign", "GET"),
+    ("/download/proxy", "GET"),
+    ("/copy", "POST"),
+    ("/lock", "POST"),
+    ("/unlock", "POST"),
+    ("/locks", "GET"),
+    ("/delete", "DELETE"),
+    # Version workflow endpoints
+    ("/versions", "GET"),
+    ("/versions/commit", "POST"),
+    ("/versions/some-version/approve", "POST"),
+    ("/versions/some-version/reject", "POST"),
+]
+
+
+class TestEndpointRegistration:
+    """Test cases for endpoint registration and authentication."""
+
+    @pytest.mark.parametrize("endpoint,method", PROTECTED_ENDPOINTS)
+    def test_endpoint_requires_auth(self, client, endpoint, method):
+        """Requests without a JWT are rejected with 401."""
+        response = client.open(endpoint, method=method, json={})
+
+        assert response.status_code == 401
@@ -6,10 +6,25 @@ It ensures that the app is created correctly, custom error handlers work as expe
 and the main run logic is invoked properly.
 """
 
+import pytest
 from flask import Flask
 import app
 
 
+@pytest.fixture(name="app")
+def fresh_app():
+    """
+    Application built for each test of this module only.
+
+    The error handler tests register their own routes, which Flask refuses
+    on the session-wide application once it has served a request.
+    """
+    application = app.create_app("app.config.TestingConfig")
+    application.config.update({"TESTING": True})
+    with application.app_context():
+        yield application
+
+
 def test_main_runs(monkeypatch):
     """
     Test that the main run logic is called with the correct debug argument.
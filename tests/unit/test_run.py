@@ -61,6 +61,8 @@ def test_run_config_mapping(
             patch("run.logger", mock_logger),
             patch("run.load_dotenv", mock_load_dotenv),
             patch("run.os.path.exists", mock_os_path_exists),
+            # Gunicorn not installed: staging uses the dev server
+            patch("run.shutil.which", return_value=None),
         ):
             # Call main function
             main()
@@ -209,6 +211,8 @@ def test_main_debug_mode_from_app_config():
                 patch("run.logger", mock_logger),
                 patch("run.load_dotenv", mock_load_dotenv),
                 patch("run.os.path.exists", mock_os_path_exists),
+                # Gunicorn not installed: staging uses the dev server
+                patch("run.shutil.which", return_value=None),
             ):
                 main()
 
@@ -303,6 +307,8 @@ def test_app_mode_skips_env_file():
             patch("run.logger", mock_logger),
             patch("run.load_dotenv", mock_load_dotenv),
             patch("run.os.path.exists", mock_os_path_exists),
+            # Gunicorn not installed: staging uses the dev server
+            patch("run.shutil.which", return_value=None),
         ):
             main()
 
@@ -324,3 +330,27 @@ def test_app_mode_skips_env_file():
             os.environ["APP_MODE"] = original_app_mode
         elif "APP_MODE" in os.environ:
             del os.environ["APP_MODE"]
+
+
+def test_staging_execs_gunicorn():
+    """
+    Test that staging hands the process over to Gunicorn when installed.
+    """
+    env = {"FLASK_ENV": "staging", "APP_MODE": "staging", "PORT": "8080"}
+    mock_create_app = MagicMock()
+
+    with (
+        patch.dict(os.environ, env),
+        patch("run.create_app", mock_create_app),
+        patch("run.logger", MagicMock()),
+        patch("run.shutil.which", return_value="/usr/bin/gunicorn"),
+        patch("run.os.execvp") as mock_execvp,
+    ):
+        main()
+
+    mock_create_app.assert_not_called()
+    program, argv = mock_execvp.call_args.args
+    assert program == "gunicorn"
+    assert argv[argv.index("--worker-class") + 1] == "gthread"
+    assert argv[argv.index("--bind") + 1] == "0.0.0.0:8080"
+    assert argv[-1] == "app:create_app('app.config.StagingConfig')"
@@ -2,11 +2,36 @@
 Tests for utility functions in app.utils module.
 """
 
+import socket
+import time
 from unittest import mock
 
+import jwt
 import requests
-
-from app.utils import check_access
+from flask import g
+from urllib3.exceptions import ReadTimeoutError
+
+from app.jwt_auth import (
+    _access_token,
+    _decode_jwt,
+    _forward_headers,
+    _jwt_cache,
+    _jwt_decoder,
+    _jwt_secret,
+    extract_jwt_data,
+)
+from app.utils import (
+    _access_cache,
+    _guardian_session,
+    _guardian_settings,
+    _project_session,
+    camel_to_snake,
+    check_access,
+    check_access_required,
+    invalidate_access_cache,
+    reload_config,
+    require_jwt_auth,
+)
 
 
 class TestCheckAccess:
@@ -54,8 +79,8 @@ class TestCheckAccess:
             "status": 200,
         }
 
-        with mock.patch(
-            "requests.post", return_value=mock_response
+        with mock.patch.object(
+            _guardian_session, "post", return_value=mock_response
         ) as mock_post:
             with mock.patch.dict(
                 "os.environ",
@@ -95,7 +120,9 @@ class TestCheckAccess:
             "status": 403,
         }
 
-        with mock.patch("requests.post", return_value=mock_response):
+        with mock.patch.object(
+            _guardian_session, "post", return_value=mock_response
+        ):
             with mock.patch.dict(
                 "os.environ",
                 {
@@ -120,7 +147,9 @@ class TestCheckAccess:
             "reason": "Invalid user_id format",
         }
 
-        with mock.patch("requests.post", return_value=mock_response):
+        with mock.patch.object(
+            _guardian_session, "post", return_value=mock_response
+        ):
             with mock.patch.dict(
                 "os.environ",
                 {
@@ -145,7 +174,9 @@ class TestCheckAccess:
         )
         mock_response.text = "Bad Request: Invalid parameters"
 
-        with mock.patch("requests.post", return_value=mock_response):
+        with mock.patch.object(
+            _guardian_session, "post", return_value=mock_response
+        ):
             with mock.patch.dict(
                 "os.environ",
                 {
@@ -170,7 +201,9 @@ class TestCheckAccess:
         mock_response.status_code = 500
         mock_response.text = "Internal Server Error"
 
-        with mock.patch("requests.post", return_value=mock_response):
+        with mock.patch.object(
+            _guardian_session, "post", return_value=mock_response
+        ):
             with mock.patch.dict(
                 "os.environ",
                 {
@@ -188,8 +221,8 @@ class TestCheckAccess:
 
     def test_check_access_guardian_timeout(self):
         """Test Guardian service timeout."""
-        with mock.patch(
-            "requests.post", side_effect=requests.exceptions.Timeout
+        with mock.patch.object(
+            _guardian_session, "post", side_effect=requests.exceptions.Timeout
         ):
             with mock.patch.dict(
                 "os.environ",
@@ -208,8 +241,10 @@ class TestCheckAccess:
 
     def test_check_access_guardian_connection_error(self):
         """Test Guardian service connection error."""
-        with mock.patch(
-            "requests.post", side_effect=requests.exceptions.ConnectionError
+        with mock.patch.object(
+            _guardian_session,
+            "post",
+            side_effect=requests.exceptions.ConnectionError,
         ):
             with mock.patch.dict(
                 "os.environ",
@@ -236,8 +271,8 @@ class TestCheckAccess:
             "status": 200,
         }
 
-        with mock.patch(
-            "requests.post", return_value=mock_response
+        with mock.patch.object(
+            _guardian_session, "post", return_value=mock_response
         ) as mock_post:
             with mock.patch.dict(
                 "os.environ",
@@ -280,8 +315,8 @@ class TestCheckAccess:
         with app.test_request_context(
             "/", headers={"Cookie": "access_token=test-jwt-token"}
         ):
-            with mock.patch(
-                "requests.post", return_value=mock_response
+            with mock.patch.object(
+                _guardian_session, "post", return_value=mock_response
             ) as mock_post:
                 with mock.patch.dict(
                     "os.environ",
@@ -321,8 +356,8 @@ class TestCheckAccess:
         app = Flask(__name__)
 
         with app.test_request_context("/"):
-            with mock.patch(
-                "requests.post", return_value=mock_response
+            with mock.patch.object(
+                _guardian_session, "post", return_value=mock_response
             ) as mock_post:
                 with mock.patch.dict(
                     "os.environ",
@@ -345,3 +380,453 @@ class TestCheckAccess:
                         headers={},
                         timeout=5.0,
                     )
+
+
+class TestCheckAccessCache:
+    """Test cases for the Guardian decision cache."""
+
+    @staticmethod
+    def _guardian_response(access_granted):
+        """Build a 200 Guardian response."""
+        response = mock.Mock()
+        response.status_code = 200
+        response.json.return_value = {
+            "access_granted": access_granted,
+            "reason": "reason",
+            "status": 200 if access_granted else 403,
+        }
+        return response
+
+    def _check_twice(self, access_granted):
+        """Call check_access twice and return the mocked requests.post."""
+        with mock.patch.object(
+            _guardian_session,
+            "post",
+            return_value=self._guardian_response(access_granted),
+        ) as mock_post:
+            with mock.patch.dict(
+                "os.environ",
+                {
+                    "FLASK_ENV": "production",
+                    "GUARDIAN_SERVICE_URL": "http://guardian:5000",
+                },
+            ):
+                first = check_access("user123", "user", "list")
+                second = check_access("user123", "user", "list")
+        assert first == second
+        return mock_post
+
+    def test_granted_decision_is_cached(self):
+        """A granted access is reused without calling Guardian again."""
+        assert self._check_twice(True).call_count == 1
+
+    def test_denied_decision_is_not_cached(self):
+        """A denied access is always checked against Guardian."""
+        assert self._check_twice(False).call_count == 2
+
+    def test_invalidate_drops_only_that_user(self):
+        """invalidate_access_cache(user_id) keeps other users' entries."""
+        _access_cache.set(("user123", "user", "list", None), (True, "", 200))
+        _access_cache.set(("user456", "user", "list", None), (True, "", 200))
+
+        invalidate_access_cache("user123")
+
+        assert ("user123", "user", "list", None) not in _access_cache
+        assert ("user456", "user", "list", None) in _access_cache
+
+        invalidate_access_cache()
+        assert len(_access_cache) == 0
+
+    def test_cache_is_keyed_on_token(self):
+        """A different JWT never reuses another token's decision."""
+        from flask import Flask
+
+        app = Flask(__name__)
+        env = {
+            "FLASK_ENV": "production",
+            "GUARDIAN_SERVICE_URL": "http://guardian:5000",
+        }
+        with mock.patch.object(
+            _guardian_session,
+            "post",
+            return_value=self._guardian_response(True),
+        ) as mock_post, mock.patch.dict("os.environ", env):
+            for token in ("token-a", "token-b"):
+                with app.test_request_context(
+                    "/", headers={"Cookie": f"access_token={token}"}
+                ):
+                    check_access("user123", "user", "list")
+
+        assert mock_post.call_count == 2
+
+
+class TestGuardianSession:
+    """Test cases for the pooled Guardian HTTP session."""
+
+    def test_adapter_is_pooled_and_retries(self):
+        """Both schemes share a 50-connection pool with bounded retries."""
+        # pylint: disable=protected-access
+        for url in ("http://guardian:5000", "https://guardian"):
+            adapter = _guardian_session.get_adapter(url)
+            assert adapter._pool_maxsize == 50
+            assert adapter.max_retries.total == 2
+            assert 503 in adapter.max_retries.status_forcelist
+
+    def test_sessions_ask_for_json(self):
+        """Both service sessions send Accept: application/json."""
+        for session in (_guardian_session, _project_session):
+            assert session.headers["Accept"] == "application/json"
+
+    def test_project_service_session_is_pooled(self):
+        """Project service checks get their own pooled session."""
+        # pylint: disable=protected-access
+        adapter = _project_session.get_adapter("http://project:5001")
+        assert adapter is not _guardian_session.get_adapter("http://x")
+        assert adapter._pool_maxsize == 50
+        assert adapter.max_retries.total == 0
+
+    def test_guardian_read_timeout_is_not_retried(self):
+        """A read timeout is reported as 504 after a single attempt."""
+        read_timeout = ReadTimeoutError(None, "/check", "Read timed out.")
+        with mock.patch(
+            "urllib3.connectionpool.HTTPConnectionPool._make_request",
+            side_effect=read_timeout,
+        ) as make_request, mock.patch.dict(
+            "os.environ",
+            {
+                "FLASK_ENV": "production",
+                "GUARDIAN_SERVICE_URL": "http://guardian:5000",
+            },
+        ):
+            access_granted, reason, status = check_access(
+                "user123", "user", "list"
+            )
+
+        assert access_granted is False
+        assert "timeout" in reason.lower()
+        assert status == 504
+        assert make_request.call_count == 1
+
+    def test_pooled_sockets_use_keepalive(self):
+        """Guardian connections are opened with SO_KEEPALIVE set."""
+        adapter = _guardian_session.get_adapter("http://guardian:5000")
+        socket_options = adapter.poolmanager.connection_pool_kw[
+            "socket_options"
+        ]
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in socket_options
+
+
+class TestExtractJwtData:
+    """Test cases for extract_jwt_data."""
+
+    def test_token_is_decoded_once_per_request(self):
+        """Repeated calls within a request reuse the decoded payload."""
+        from flask import Flask
+
+        token = jwt.encode(
+            {"sub": "user123", "company_id": "company456"},
+            "secret",
+            algorithm="HS256",
+        )
+        app = Flask(__name__)
+
+        with app.test_request_context(
+            "/", headers={"Cookie": f"access_token={token}"}
+        ), mock.patch.dict("os.environ", {"JWT_SECRET": "secret"}):
+            with mock.patch.object(
+                _jwt_decoder, "decode", wraps=_jwt_decoder.decode
+            ) as dec:
+                first = extract_jwt_data()
+                second = extract_jwt_data()
+
+        assert first["user_id"] == "user123"
+        assert second is first
+        dec.assert_called_once()
+
+    def test_token_is_decoded_once_across_requests(self):
+        """A token reused by later requests is not verified again."""
+        from flask import Flask
+
+        token = jwt.encode(
+            {"sub": "user123", "exp": time.time() + 600},
+            "secret",
+            algorithm="HS256",
+        )
+        app = Flask(__name__)
+
+        with mock.patch.dict(
+            "os.environ", {"JWT_SECRET": "secret"}
+        ), mock.patch.object(
+            _jwt_decoder, "decode", wraps=_jwt_decoder.decode
+        ) as dec:
+            for _ in range(2):
+                with app.test_request_context(
+                    "/", headers={"Cookie": f"access_token={token}"}
+                ):
+                    assert extract_jwt_data()["user_id"] == "user123"
+
+        dec.assert_called_once()
+
+    def test_cached_payload_is_keyed_on_secret(self):
+        """A reloaded JWT_SECRET invalidates previously verified tokens."""
+        from flask import Flask
+
+        token = jwt.encode({"sub": "user123"}, "secret", algorithm="HS256")
+        app = Flask(__name__)
+
+        for secret, expected in (("secret", "user123"), ("rotated", None)):
+            with app.test_request_context(
+                "/", headers={"Cookie": f"access_token={token}"}
+            ), mock.patch.dict("os.environ", {"JWT_SECRET": secret}):
+                reload_config()
+                data = extract_jwt_data()
+            assert (data and data["user_id"]) == expected
+
+    def test_cache_entry_does_not_outlive_token(self):
+        """Entries expire with the token's exp claim."""
+        token = jwt.encode(
+            {"sub": "user123", "exp": time.time() + 5},
+            "secret",
+            algorithm="HS256",
+        )
+        with mock.patch.dict("os.environ", {"JWT_SECRET": "secret"}):
+            _decode_jwt(token)
+
+        _, deadline = _jwt_cache.get_with_deadline((token, "secret"))
+        assert deadline - time.monotonic() <= 5
+
+
+class TestAccessToken:
+    """Test cases for the per-request access_token lookup."""
+
+    def test_cookie_is_resolved_once_per_request(self):
+        """The cookie value is stored on g and reused."""
+        from flask import Flask
+
+        app = Flask(__name__)
+        with app.test_request_context(
+            "/", headers={"Cookie": "access_token=abc"}
+        ):
+            assert _access_token() == "abc"
+            assert g.access_token == "abc"
+            g.access_token = "cached"
+            assert _access_token() == "cached"
+
+    def test_cookie_is_not_shared_across_requests(self):
+        """Requests served under one app context each see their cookie."""
+        from flask import Flask
+
+        app = Flask(__name__)
+
+        @app.route("/whoami")
+        @require_jwt_auth()
+        def whoami():
+            return {"user_id": g.user_id}, 200
+
+        company_id = "a1b2c3d4-e5f6-7890-abcd-ef1234567890"
+        tokens = {
+            user_id: jwt.encode(
+                {"sub": user_id, "company_id": company_id},
+                "secret",
+                algorithm="HS256",
+            )
+            for user_id in ("user1", "user2")
+        }
+        with mock.patch.dict(
+            "os.environ", {"JWT_SECRET": "secret"}
+        ), app.app_context():
+            _jwt_secret.cache_clear()
+            try:
+                for user_id, token in tokens.items():
+                    client = app.test_client()
+                    client.set_cookie("access_token", token)
+                    response = client.get("/whoami")
+                    assert response.get_json() == {"user_id": user_id}
+                response = app.test_client().get("/whoami")
+                assert response.status_code == 401
+            finally:
+                _jwt_secret.cache_clear()
+
+    def test_no_request_context(self):
+        """Outside a request there is no token."""
+        assert _access_token() is None
+
+    def test_forward_headers_are_built_once(self):
+        """The Cookie header dict is shared by every forwarding call."""
+        from flask import Flask
+
+        app = Flask(__name__)
+        with app.test_request_context(
+            "/", headers={"Cookie": "access_token=abc"}
+        ):
+            headers = _forward_headers()
+            assert headers == {"Cookie": "access_token=abc"}
+            assert _forward_headers() is headers
+        with app.test_request_context("/"):
+            assert not _forward_headers()
+
+        # Requests sharing one pushed app context (and so one g) must not
+        # forward each other's cookie
+        with app.app_context():
+            with app.test_request_context(
+                "/", headers={"Cookie": "access_token=abc"}
+            ):
+                assert _forward_headers() == {"Cookie": "access_token=abc"}
+            with app.test_request_context(
+                "/", headers={"Cookie": "access_token=def"}
+            ):
+                assert _forward_headers() == {"Cookie": "access_token=def"}
+            with app.test_request_context("/"):
+                assert not _forward_headers()
+
+
+class TestCheckAccessRequired:
+    """Test cases for the check_access_required decorator."""
+
+    def test_decoded_token_is_shared_with_view(self):
+        """Without require_jwt_auth, the decoded JWT is stored on g."""
+        from flask import Flask
+
+        class FileResource:  # pylint: disable=too-few-public-methods
+            """Stand-in resource class."""
+
+            @check_access_required("read")
+            def get(self):
+                """Return the JWT data seen by the view."""
+                return g.get("jwt_data"), 200
+
+        token = jwt.encode({"sub": "user123"}, "secret", algorithm="HS256")
+        app = Flask(__name__)
+
+        with app.test_request_context(
+            "/", headers={"Cookie": f"access_token={token}"}
+        ), mock.patch.dict(
+            "os.environ", {"JWT_SECRET": "secret", "FLASK_ENV": "testing"}
+        ):
+            jwt_data, status = FileResource().get()
+
+        assert status == 200
+        assert jwt_data["user_id"] == "user123"
+
+
+class TestRequireJwtAuth:
+    """Test cases for the company_id check in require_jwt_auth."""
+
+    @staticmethod
+    def _call(company_id):
+        """Run a decorated view with header-based identity."""
+        from flask import Flask
+
+        app = Flask(__name__)
+        view = require_jwt_auth()(lambda: ("ok", 200))
+        with app.test_request_context(
+            "/",
+            headers={"X-User-ID": "user123", "X-Company-ID": company_id},
+        ):
+            return view()
+
+    def test_canonical_uuid_is_accepted(self):
+        """A canonical 8-4-4-4-12 UUID passes validation."""
+        assert self._call("A1B2C3D4-e5f6-7890-abcd-ef1234567890")[1] == 200
+
+    def test_invalid_uuid_is_rejected(self):
+        """Malformed or non-canonical company ids are rejected."""
+        for company_id in (
+            "not-a-uuid",
+            "a1b2c3d4e5f67890abcdef1234567890",
+            "{a1b2c3d4-e5f6-7890-abcd-ef1234567890}",
+            "urn:uuid:a1b2c3d4-e5f6-7890-abcd-ef1234567890",
+        ):
+            assert self._call(company_id)[1] == 401
+
+
+class TestLazyJsonData:
+    """Test cases for the lazily parsed g.json_data."""
+
+    @staticmethod
+    def _run(view, **request_kwargs):
+        """Run a require_jwt_auth-decorated view in a request context."""
+        from flask import Flask
+
+        app = Flask(__name__)
+        headers = {
+            "X-User-ID": "user123",
+            "X-Company-ID": "a1b2c3d4-e5f6-7890-abcd-ef1234567890",
+        }
+        with app.test_request_context(
+            "/", method="POST", headers=headers, **request_kwargs
+        ):
+            return require_jwt_auth()(view)()
+
+    def test_body_not_parsed_when_unused(self):
+        """Views that ignore g.json_data never trigger a JSON parse."""
+        with mock.patch("flask.Request.get_json", autospec=True) as get_json:
+            self._run(lambda: "ok", json={"bucket_type": "users"})
+        get_json.assert_not_called()
+
+    def test_body_parsed_on_access(self):
+        """g.json_data behaves like the parsed body."""
+
+        def view():
+            data = g.json_data
+            return bool(data), "bucket_type" in data, data.get("bucket_type")
+
+        assert self._run(view, json={"bucket_type": "users"}) == (
+            True,
+            True,
+            "users",
+        )
+
+    def test_non_json_body_is_none(self):
+        """Non-JSON requests leave g.json_data unset."""
+        assert (
+            self._run(
+                lambda: g.json_data, data="a=b", content_type="text/plain"
+            )
+            is None
+        )
+
+
+class TestGuardianSettings:
+    """Test cases for the cached Guardian settings."""
+
+    def test_settings_are_read_once_until_reload(self):
+        """Environment changes are only picked up after reload_config()."""
+        env = {"FLASK_ENV": "production", "GUARDIAN_SERVICE_URL": "http://a"}
+        with mock.patch.dict("os.environ", env):
+            first = _guardian_settings()
+            assert first.bypass is False
+            assert first.check_url == "http://a/check-access"
+            with mock.patch.dict("os.environ", {"FLASK_ENV": "testing"}):
+                assert _guardian_settings() is first
+                reload_config()
+                assert _guardian_settings().bypass is True
+
+    def test_jwt_secret_is_read_once_until_reload(self):
+        """JWT_SECRET changes are only picked up after reload_config()."""
+        with mock.patch.dict("os.environ", {"JWT_SECRET": "first"}):
+            assert _jwt_secret() == "first"
+            with mock.patch.dict("os.environ", {"JWT_SECRET": "second"}):
+                assert _jwt_secret() == "first"
+                reload_config()
+                assert _jwt_secret() == "second"
+
+
+class TestCamelToSnake:
+    """Test cases for camel_to_snake."""
+
+    def test_camel_case_is_converted(self):
+        """CamelCase class names become snake_case."""
+        assert camel_to_snake("StorageFileList") == "storage_file_list"
+        assert camel_to_snake("HTTPResponse") == "http_response"
+
+    def test_snake_case_is_returned_unchanged(self):
+        """Names that are already snake_case skip the regex passes."""
+        camel_to_snake.cache_clear()
+        with mock.patch("app.utils._CAMEL_WORD_RE") as word_re:
+            assert camel_to_snake("storage_file") == "storage_file"
+        word_re.sub.assert_not_called()
+
+    def test_repeated_underscores_are_collapsed(self):
+        """Lowercase names with runs of underscores are still normalized."""
+        assert camel_to_snake("storage__file") == "storage_file"